@@ -5,23 +5,31 @@ This module defines the REST API routes for file upload, processing,
 and status monitoring.
 """
 
+import asyncio
+import codecs
+import hashlib
+import re
 import time
 from datetime import datetime
-from typing import Dict, Any
-from uuid import uuid4
+from typing import AsyncIterator, BinaryIO, Dict, Any, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response
 
 from app.core.config import get_settings
-from app.core.logging import get_logger, RequestIDContext, HealthcareOperationContext
-from app.core.lifespan import get_mongo_service, get_openmrs_client
+from app.core.ids import get_request_id
+from app.core.logging import (
+    get_logger, log_exception, RequestIDContext, HealthcareOperationContext,
+    DEBUG_ENABLED, INFO_ENABLED
+)
+from app.core.lifespan import get_mongo_service, get_openmrs_client, get_ingestion_service
 from app.services.mongo_service import MongoService
 from app.services.openmrs_client import OpenMRSRestClient
-from app.services.ingestion_service import TM2IngestionService
+from app.services.ingestion_service import TM2IngestionService, FileTooLargeError
 from app.models.api_models import (
     ProcessingResult, SystemStatus, ErrorResponse, HealthCheckResponse,
-    ProcessingStatus, ServiceStatus, ComponentHealth, ServiceStatistics,
+    ProcessingStatus, ServiceStatus, ServiceStatistics,
     DatabaseStatistics, OpenMRSStatistics
 )
 
@@ -30,25 +38,367 @@ router = APIRouter()
 settings = get_settings()
 logger = get_logger(__name__)
 
-# Service startup time for uptime calculation
-SERVICE_START_TIME = time.time()
+# Monotonic service startup time for uptime calculation (immune to clock jumps)
+SERVICE_START_NS = time.monotonic_ns()
 
+# Size of each chunk read from an uploaded file; matches the size at which
+# uploads are spooled to disk, so large files take few worker-thread reads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-def get_ingestion_service(
-    mongo_service: MongoService = Depends(get_mongo_service),
-    openmrs_client: OpenMRSRestClient = Depends(get_openmrs_client)
-) -> TM2IngestionService:
+# Accepted upload suffix (compared case-insensitively)
+CSV_SUFFIX = ".csv"
+
+# Leading bytes inspected to recognise a CSV header row
+CSV_SNIFF_SIZE = 512
+CSV_HEADER_PATTERN = re.compile(rb'^"?[A-Za-z_][\w ",-]*(\r?\n|$)')
+
+# Error details for rejected uploads, built once and shared by every
+# request; they are only read when the error response is rendered
+ERR_INVALID_FILE_TYPE = {
+    "error_code": "INVALID_FILE_TYPE",
+    "message": "Only CSV files are supported",
+    "supported_types": (CSV_SUFFIX,)
+}
+ERR_INVALID_FILE_CONTENT = {
+    "error_code": "INVALID_FILE_CONTENT",
+    "message": "File does not start with a CSV header row"
+}
+ERR_FILE_TOO_LARGE = {
+    "error_code": "FILE_TOO_LARGE",
+    "message": f"File size exceeds {settings.max_file_size_mb}MB limit",
+    "max_size_mb": settings.max_file_size_mb
+}
+
+# Serialized degraded status returned when statistics cannot be collected.
+# Validated once at import; per-request fields are filled in on use.
+DEGRADED_STATUS_TEMPLATE = SystemStatus(
+    success=False,
+    message="System status retrieval partially failed",
+    service_status=ServiceStatus.DEGRADED,
+    version="1.0.0",
+    environment=settings.environment,
+    uptime_seconds=0,
+    processing_statistics=ServiceStatistics(
+        files_processed=0,
+        records_processed=0,
+        records_validated=0,
+        records_stored=0,
+        records_submitted=0,
+        validation_errors=0,
+        storage_errors=0,
+        submission_errors=0,
+        duplicate_records=0
+    ),
+    database_statistics=DatabaseStatistics(
+        connection_status="error",
+        total_records=0,
+        submitted_records=0,
+        failed_records=0,
+        pending_records=0,
+        collection_size=0,
+        last_updated=datetime.utcnow()
+    ),
+    openmrs_statistics=OpenMRSStatistics(
+        initialized=False,
+        base_url=settings.openmrs_base_url,
+        username=settings.openmrs_username,
+        requests_made=0,
+        successful_submissions=0,
+        failed_submissions=0,
+        patients_created=0,
+        concepts_created=0,
+        last_updated=datetime.utcnow().isoformat()
+    )
+).model_dump(mode="json")
+
+# Constant leading fields of /status and /health bodies, serialized once.
+# Each response splices its per-request fields onto this prefix.
+RESPONSE_PREFIX = orjson.dumps({
+    "version": "1.0.0",
+    "environment": settings.environment
+})[:-1] + b","
+
+
+def render_with_prefix(payload: Dict[str, Any]) -> Response:
+    """
+    Render a JSON response from the constant prefix and per-request fields.
+    
+    Args:
+        payload: Non-empty per-request response fields
+        
+    Returns:
+        Response: JSON response
+    """
+    return Response(
+        content=RESPONSE_PREFIX + orjson.dumps(payload)[1:],
+        media_type="application/json"
+    )
+
+
+def project_fields(model: type, data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Dependency to get TM2 ingestion service instance.
+    Select a response model's fields from trusted service statistics.
+    
+    Statistics come from the services themselves, so they are projected
+    onto the model's fields without validation; missing fields take the
+    model's defaults.
     
     Args:
-        mongo_service: MongoDB service dependency
-        openmrs_client: OpenMRS client dependency
+        model: Pydantic model describing the fields
+        data: Statistics dictionary
         
     Returns:
-        TM2IngestionService: Configured ingestion service
+        Dict: Field values in model order
+    """
+    return {
+        name: data[name] if name in data else field.get_default(call_default_factory=True)
+        for name, field in model.model_fields.items()
+    }
+
+
+# Seconds a health check result is reused, so bursts of load balancer
+# probes do not each query the components
+HEALTH_CACHE_TTL_SECONDS = 1.0
+
+# Monotonic time, overall status and component entries of the last health
+# check; the response itself is rendered per request
+_health_cache: Optional[Tuple[float, ServiceStatus, List[Dict[str, Any]]]] = None
+
+
+async def iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Stream an uploaded file in fixed-size chunks.
+    
+    ``UploadFile.read`` offloads disk-backed reads to a worker thread,
+    so the event loop is never blocked while the file is consumed.
+    
+    Args:
+        file: Uploaded file
+        chunk_size: Maximum number of bytes per chunk
+        
+    Yields:
+        bytes: Next chunk of file content
     """
-    return TM2IngestionService(mongo_service, openmrs_client)
+    await file.seek(0)
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+def digest_file(fileobj: BinaryIO) -> str:
+    """
+    Compute the SHA-256 digest of a file object from its start.
+    
+    Args:
+        fileobj: Seekable binary file, rewound again afterwards
+        
+    Returns:
+        str: Hex digest of the file content
+    """
+    fileobj.seek(0)
+    digest = hashlib.file_digest(fileobj, "sha256").hexdigest()
+    fileobj.seek(0)
+    return digest
+
+
+async def hash_upload(file: UploadFile) -> str:
+    """
+    Compute the SHA-256 digest of an uploaded file.
+    
+    The upload is already spooled locally, so this extra pass is cheap
+    next to parsing the file and lets re-uploads be answered from the
+    ingestion result cache. The whole file is hashed in a single worker
+    thread call rather than one thread-pool round trip per chunk, and
+    ``hashlib`` releases the GIL while it hashes.
+    
+    Args:
+        file: Uploaded file
+        
+    Returns:
+        str: Hex digest of the file content
+    """
+    return await asyncio.to_thread(digest_file, file.file)
+
+
+async def iter_request_body(request: Request) -> AsyncIterator[bytes]:
+    """
+    Stream a raw request body as it arrives from the client.
+    
+    Unlike a multipart upload, the body is never spooled to a temporary
+    file, so memory use stays flat and parsing starts with the first chunk.
+    
+    Args:
+        request: Incoming request
+        
+    Yields:
+        bytes: Next non-empty chunk of the body
+    """
+    async for chunk in request.stream():
+        if chunk:
+            yield chunk
+
+
+async def peek_stream(
+    chunks: AsyncIterator[bytes], size: int
+) -> Tuple[bytes, AsyncIterator[bytes]]:
+    """
+    Read the leading bytes of a stream without consuming them.
+    
+    Args:
+        chunks: Async iterator of byte chunks
+        size: Number of leading bytes wanted
+        
+    Returns:
+        Tuple[bytes, AsyncIterator[bytes]]: Up to ``size`` leading bytes and
+        an iterator yielding the whole stream from the start
+    """
+    iterator = chunks.__aiter__()
+    buffered = []
+    buffered_size = 0
+    while buffered_size < size and (chunk := await anext(iterator, None)) is not None:
+        buffered.append(chunk)
+        buffered_size += len(chunk)
+    
+    async def replay() -> AsyncIterator[bytes]:
+        for chunk in buffered:
+            yield chunk
+        async for chunk in iterator:
+            yield chunk
+    
+    return b"".join(buffered)[:size], replay()
+
+
+async def run_ingestion(
+    ingestion_service: TM2IngestionService,
+    request_id: str,
+    file_content: AsyncIterator[bytes],
+    filename: str,
+    content_type: Optional[str],
+    file_size: Any,
+    file_hash: Optional[str] = None
+) -> ProcessingResult:
+    """
+    Process an upload stream and build the endpoint response.
+    
+    Shared by the multipart and raw-body upload endpoints; must be called
+    inside the request's ``RequestIDContext``.
+    
+    Args:
+        ingestion_service: Ingestion service instance
+        request_id: ID of the current request
+        file_content: Async iterator of raw CSV byte chunks
+        filename: Name reported for the upload
+        content_type: Content type reported for the upload
+        file_size: Declared upload size, or 'unknown'
+        file_hash: SHA-256 hex digest of the upload, if known
+        
+    Returns:
+        ProcessingResult: Processing summary for the response
+        
+    Raises:
+        HTTPException: If the upload is too large or processing fails
+    """
+    try:
+        # Process the file
+        with HealthcareOperationContext("file_ingestion", record_count=None):
+            processing_start = time.perf_counter()
+
+            # Log file details before processing
+            if INFO_ENABLED:
+                logger.info(
+                    "Starting file processing",
+                    processing_id=request_id,
+                    filename=filename,
+                    file_size=file_size,
+                    content_type=content_type
+                )
+
+            result = await ingestion_service.process_tm2_file(
+                file_content=file_content,
+                filename=filename,
+                file_hash=file_hash
+            )
+
+            processing_time = time.perf_counter() - processing_start
+
+            # Determine overall status
+            if result["status"] == "completed":
+                summary = result.get("summary", {})
+                if summary.get("submission_errors", 0) > 0:
+                    overall_status = ProcessingStatus.PARTIAL
+                else:
+                    overall_status = ProcessingStatus.COMPLETED
+            elif result["status"] == "partial":
+                overall_status = ProcessingStatus.PARTIAL
+            else:
+                overall_status = ProcessingStatus.FAILED
+
+            # Build response
+            response = ProcessingResult(
+                success=result["status"] in ["completed", "partial"],
+                message=(
+                    f"File processing {result['status']} (cached result)"
+                    if result.get("cached") else f"File processing {result['status']}"
+                ),
+                processing_id=result["processing_id"],
+                filename=result["filename"],
+                status=overall_status,
+                summary=result.get("summary"),
+                processing_time_seconds=processing_time,
+                request_id=request_id
+            )
+
+            # Enhanced logging with detailed statistics
+            if INFO_ENABLED:
+                summary_info = result.get("summary", {})
+                logger.info(
+                    "File processing completed",
+                    processing_id=result["processing_id"],
+                    status=result["status"],
+                    processing_time_seconds=round(processing_time, 2),
+                    total_records=summary_info.get("total_records", 0),
+                    processed_records=summary_info.get("processed_records", 0),
+                    validated_records=summary_info.get("validated_records", 0),
+                    stored_records=summary_info.get("stored_records", 0),
+                    submitted_records=summary_info.get("submitted_records", 0),
+                    duplicate_records=summary_info.get("duplicate_records", 0),
+                    validation_errors=summary_info.get("validation_errors", 0),
+                    storage_errors=summary_info.get("storage_errors", 0),
+                    submission_errors=summary_info.get("submission_errors", 0)
+                )
+
+            return response
+    
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    
+    except FileTooLargeError:
+        logger.warning(
+            "File size exceeds limit",
+            filename=filename,
+            max_size_mb=settings.max_file_size_mb
+        )
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=ERR_FILE_TOO_LARGE
+        )
+    
+    except Exception as e:
+        log_exception(
+            logger,
+            "Unexpected error during file processing",
+            filename=filename,
+            error=str(e)
+        )
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error_code": "PROCESSING_ERROR",
+                "message": "An unexpected error occurred during file processing",
+                "details": str(e)
+            }
+        )
 
 
 @router.post(
@@ -64,6 +414,7 @@ def get_ingestion_service(
     }
 )
 async def trigger_ingestion(
+    request: Request,
     file: UploadFile = File(..., description="CSV file containing TM2 dataset records"),
     ingestion_service: TM2IngestionService = Depends(get_ingestion_service)
 ) -> ProcessingResult:
@@ -90,26 +441,23 @@ async def trigger_ingestion(
     5. Submission to OpenMRS via REST API
     6. Status tracking and error handling
     """
-    request_id = str(uuid4())
+    request_id = get_request_id(request)
     
     with RequestIDContext(request_id):
-        logger.info(
-            "File upload initiated",
-            filename=file.filename,
-            content_type=file.content_type,
-            file_size=file.size if hasattr(file, 'size') else 'unknown'
-        )
+        if INFO_ENABLED:
+            logger.info(
+                "File upload initiated",
+                filename=file.filename,
+                content_type=file.content_type,
+                file_size=file.size if hasattr(file, 'size') else 'unknown'
+            )
         
         # Validate file type
-        if not file.filename.endswith('.csv'):
+        if not (file.filename or "").lower().endswith(CSV_SUFFIX):
             logger.warning("Invalid file type uploaded", filename=file.filename)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error_code": "INVALID_FILE_TYPE",
-                    "message": "Only CSV files are supported",
-                    "supported_types": [".csv"]
-                }
+                detail=ERR_INVALID_FILE_TYPE
             )
         
         # Validate file size (optional)
@@ -124,96 +472,107 @@ async def trigger_ingestion(
                 )
                 raise HTTPException(
                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail={
-                        "error_code": "FILE_TOO_LARGE",
-                        "message": f"File size exceeds {max_size_mb}MB limit",
-                        "max_size_mb": max_size_mb
-                    }
+                    detail=ERR_FILE_TOO_LARGE
                 )
         
-        try:
-            # Process the file
-            with HealthcareOperationContext("file_ingestion", record_count=None):
-                processing_start = time.time()
-
-                # Log file details before processing
-                logger.info(
-                    "Starting file processing",
-                    processing_id=request_id,
-                    filename=file.filename,
-                    file_size=getattr(file, 'size', 'unknown'),
-                    content_type=file.content_type
-                )
-
-                result = await ingestion_service.process_tm2_file(
-                    file_content=file.file,
-                    filename=file.filename
-                )
-
-                processing_time = time.time() - processing_start
+        # Sniff the header line so non-CSV payloads are rejected before parsing
+        head = await file.read(CSV_SNIFF_SIZE)
+        await file.seek(0)
+        if not CSV_HEADER_PATTERN.match(head.lstrip(codecs.BOM_UTF8).lstrip()):
+            logger.warning("Uploaded file has no CSV header row", filename=file.filename)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERR_INVALID_FILE_CONTENT
+            )
+        
+        return await run_ingestion(
+            ingestion_service,
+            request_id,
+            iter_upload(file),
+            file.filename,
+            file.content_type,
+            getattr(file, 'size', 'unknown'),
+            await hash_upload(file) if settings.ingest_cache_ttl_seconds > 0 else None
+        )
 
-                # Determine overall status
-                if result["status"] == "completed":
-                    summary = result.get("summary", {})
-                    if summary.get("submission_errors", 0) > 0:
-                        overall_status = ProcessingStatus.PARTIAL
-                    else:
-                        overall_status = ProcessingStatus.COMPLETED
-                else:
-                    overall_status = ProcessingStatus.FAILED
 
-                # Build response
-                response = ProcessingResult(
-                    success=result["status"] in ["completed", "partial"],
-                    message=f"File processing {result['status']}",
-                    processing_id=result["processing_id"],
-                    filename=result["filename"],
-                    status=overall_status,
-                    summary=result.get("summary"),
-                    processing_time_seconds=processing_time,
-                    request_id=request_id
-                )
-
-                # Enhanced logging with detailed statistics
-                summary_info = result.get("summary", {})
-                logger.info(
-                    "File processing completed",
-                    processing_id=result["processing_id"],
-                    status=result["status"],
-                    processing_time_seconds=round(processing_time, 2),
-                    total_records=summary_info.get("total_records", 0),
-                    processed_records=summary_info.get("processed_records", 0),
-                    validated_records=summary_info.get("validated_records", 0),
-                    stored_records=summary_info.get("stored_records", 0),
-                    submitted_records=summary_info.get("submitted_records", 0),
-                    duplicate_records=summary_info.get("duplicate_records", 0),
-                    validation_errors=summary_info.get("validation_errors", 0),
-                    storage_errors=summary_info.get("storage_errors", 0),
-                    submission_errors=summary_info.get("submission_errors", 0)
-                )
-
-                return response
+@router.post(
+    "/ingest/stream",
+    response_model=ProcessingResult,
+    summary="Stream and process a raw TM2 CSV body",
+    description="Process a CSV file sent as the raw request body, parsed while it is received",
+    responses={
+        200: {"description": "File processed successfully"},
+        400: {"description": "Invalid file format or validation errors"},
+        413: {"description": "File exceeds the size limit"},
+        500: {"description": "Internal server error"}
+    }
+)
+async def stream_ingestion(
+    request: Request,
+    filename: str = Query("upload.csv", description="Name recorded for the uploaded CSV file"),
+    ingestion_service: TM2IngestionService = Depends(get_ingestion_service)
+) -> ProcessingResult:
+    """
+    Process a TM2 dataset file streamed as the raw request body.
+    
+    Accepts the same CSV format as ``/ingest/trigger`` but skips multipart
+    decoding: the body is handed to the parser chunk by chunk as it
+    arrives instead of being spooled to a temporary file first, which
+    keeps memory flat and overlaps the upload with processing for large
+    files. Oversize bodies are rejected from ``Content-Length`` before
+    reading, and streamed bodies are cut off once they pass the limit.
+    """
+    request_id = get_request_id(request)
+    
+    with RequestIDContext(request_id):
+        content_type = request.headers.get("content-type")
+        content_length = request.headers.get("content-length")
+        if INFO_ENABLED:
+            logger.info(
+                "File stream initiated",
+                filename=filename,
+                content_type=content_type,
+                file_size=content_length or 'unknown'
+            )
         
-        except HTTPException:
-            # Re-raise HTTP exceptions
-            raise
+        if not filename.lower().endswith(CSV_SUFFIX):
+            logger.warning("Invalid file type uploaded", filename=filename)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERR_INVALID_FILE_TYPE
+            )
         
-        except Exception as e:
-            logger.error(
-                "Unexpected error during file processing",
-                filename=file.filename,
-                error=str(e),
-                exc_info=True
+        max_size_mb = settings.max_file_size_mb
+        if content_length and content_length.isdigit() and int(content_length) > max_size_mb * 1024 * 1024:
+            logger.warning(
+                "File size exceeds limit",
+                filename=filename,
+                file_size=int(content_length),
+                max_size_mb=max_size_mb
             )
-            
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={
-                    "error_code": "PROCESSING_ERROR",
-                    "message": "An unexpected error occurred during file processing",
-                    "details": str(e)
-                }
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=ERR_FILE_TOO_LARGE
             )
+        
+        # Sniff the header line so non-CSV payloads are rejected before parsing
+        head, file_content = await peek_stream(iter_request_body(request), CSV_SNIFF_SIZE)
+        if not CSV_HEADER_PATTERN.match(head.lstrip(codecs.BOM_UTF8).lstrip()):
+            logger.warning("Uploaded file has no CSV header row", filename=filename)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERR_INVALID_FILE_CONTENT
+            )
+        
+        return await run_ingestion(
+            ingestion_service,
+            request_id,
+            file_content,
+            filename,
+            content_type,
+            content_length or 'unknown'
+        )
 
 
 @router.get(
@@ -223,8 +582,9 @@ async def trigger_ingestion(
     description="Retrieve current system status, processing statistics, and service health information"
 )
 async def get_system_status(
+    request: Request,
     ingestion_service: TM2IngestionService = Depends(get_ingestion_service)
-) -> SystemStatus:
+) -> Response:
     """
     Get comprehensive system status and statistics.
     
@@ -235,7 +595,7 @@ async def get_system_status(
     - OpenMRS client status and submission metrics
     - Service uptime and performance data
     """
-    request_id = str(uuid4())
+    request_id = get_request_id(request)
     
     with RequestIDContext(request_id):
         logger.info("System status requested")
@@ -245,74 +605,55 @@ async def get_system_status(
             status_data = await ingestion_service.get_processing_status()
             
             # Calculate uptime
-            uptime_seconds = time.time() - SERVICE_START_TIME
+            uptime_seconds = (time.monotonic_ns() - SERVICE_START_NS) / 1e9
             
             # Build comprehensive status response
-            response = SystemStatus(
-                success=True,
-                message="System status retrieved successfully",
-                service_status=ServiceStatus.OPERATIONAL,
-                version="1.0.0",
-                environment=settings.environment,
-                uptime_seconds=uptime_seconds,
-                processing_statistics=ServiceStatistics(**status_data["processing_statistics"]),
-                database_statistics=DatabaseStatistics(**status_data["mongodb_statistics"]),
-                openmrs_statistics=OpenMRSStatistics(**status_data["openmrs_statistics"]),
-                request_id=request_id
-            )
+            response = render_with_prefix({
+                "success": True,
+                "message": "System status retrieved successfully",
+                "timestamp": datetime.utcnow(),
+                "request_id": request_id,
+                "service_status": ServiceStatus.OPERATIONAL.value,
+                "uptime_seconds": uptime_seconds,
+                "processing_statistics": project_fields(
+                    ServiceStatistics, status_data["processing_statistics"]
+                ),
+                "database_statistics": project_fields(
+                    DatabaseStatistics, status_data["mongodb_statistics"]
+                ),
+                "openmrs_statistics": project_fields(
+                    OpenMRSStatistics, status_data["openmrs_statistics"]
+                )
+            })
             
             logger.info("System status retrieved successfully")
             
             return response
         
         except Exception as e:
-            logger.error(
+            log_exception(
+                logger,
                 "Failed to retrieve system status",
-                error=str(e),
-                exc_info=True
+                error=str(e)
             )
             
-            # Return degraded status with partial information
-            return SystemStatus(
-                success=False,
-                message="System status retrieval partially failed",
-                service_status=ServiceStatus.DEGRADED,
-                version="1.0.0",
-                environment=settings.environment,
-                uptime_seconds=time.time() - SERVICE_START_TIME,
-                processing_statistics=ServiceStatistics(
-                    files_processed=0,
-                    records_processed=0,
-                    records_validated=0,
-                    records_stored=0,
-                    records_submitted=0,
-                    validation_errors=0,
-                    storage_errors=0,
-                    submission_errors=0,
-                    duplicate_records=0
-                ),
-                database_statistics=DatabaseStatistics(
-                    connection_status="error",
-                    total_records=0,
-                    submitted_records=0,
-                    failed_records=0,
-                    pending_records=0,
-                    collection_size=0,
-                    last_updated=datetime.utcnow()
-                ),
-                openmrs_statistics=OpenMRSStatistics(
-                    initialized=False,
-                    base_url=settings.openmrs_base_url,
-                    username=settings.openmrs_username,
-                    requests_made=0,
-                    successful_submissions=0,
-                    failed_submissions=0,
-                    patients_created=0,
-                    concepts_created=0,
-                    last_updated=datetime.utcnow().isoformat()
-                ),
-                request_id=request_id
-            )
+            # Return degraded status from the prebuilt payload, refreshing
+            # only the per-request fields
+            now = datetime.utcnow().isoformat()
+            return ORJSONResponse({
+                **DEGRADED_STATUS_TEMPLATE,
+                "timestamp": now,
+                "request_id": request_id,
+                "uptime_seconds": (time.monotonic_ns() - SERVICE_START_NS) / 1e9,
+                "database_statistics": {
+                    **DEGRADED_STATUS_TEMPLATE["database_statistics"],
+                    "last_updated": now
+                },
+                "openmrs_statistics": {
+                    **DEGRADED_STATUS_TEMPLATE["openmrs_statistics"],
+                    "last_updated": now
+                }
+            })
 
 
 @router.get(
@@ -322,9 +663,10 @@ async def get_system_status(
     description="Simple health check for monitoring and load balancer integration"
 )
 async def health_check(
+    request: Request,
     mongo_service: MongoService = Depends(get_mongo_service),
     openmrs_client: OpenMRSRestClient = Depends(get_openmrs_client)
-) -> HealthCheckResponse:
+) -> Response:
     """
     Perform health check of service components.
     
@@ -334,92 +676,131 @@ async def health_check(
     - Quick service availability verification
     
     It checks the status of critical components and returns
-    an overall health assessment.
+    an overall health assessment. Component results are reused for
+    ``HEALTH_CACHE_TTL_SECONDS``, so the services are only probed when
+    a fresh check is needed; the request ID and timestamp are always
+    those of the current request.
+    """
+    global _health_cache
+    
+    request_id = get_request_id(request)
+    now = time.monotonic()
+    if _health_cache and now - _health_cache[0] < HEALTH_CACHE_TTL_SECONDS:
+        _, overall_status, components = _health_cache
+    else:
+        with RequestIDContext(request_id):
+            overall_status, components = await check_components(mongo_service, openmrs_client)
+        _health_cache = (now, overall_status, components)
+    
+    return render_with_prefix({
+        "success": overall_status in [ServiceStatus.OPERATIONAL, ServiceStatus.DEGRADED],
+        "message": f"Health check completed - status: {overall_status.value}",
+        "timestamp": datetime.utcnow(),
+        "request_id": request_id,
+        "overall_status": overall_status.value,
+        "components": components
+    })
+
+
+async def check_components(
+    mongo_service: MongoService,
+    openmrs_client: OpenMRSRestClient
+) -> Tuple[ServiceStatus, List[Dict[str, Any]]]:
+    """
+    Probe the MongoDB service and OpenMRS client concurrently.
+    
+    Component entries are built from service statistics and follow the
+    ComponentHealth fields, so they are serialized without validation.
+    
+    Args:
+        mongo_service: MongoDB service to probe
+        openmrs_client: OpenMRS client to probe
+        
+    Returns:
+        Tuple: Overall service status and one entry per component
     """
-    request_id = str(uuid4())
+    checked_at = datetime.utcnow()
     components = []
     overall_status = ServiceStatus.OPERATIONAL
     
-    with RequestIDContext(request_id):
+    if DEBUG_ENABLED:
         logger.debug("Health check initiated")
+    
+    # Probe both components concurrently
+    mongo_stats, openmrs_stats = await asyncio.gather(
+        mongo_service.get_statistics(),
+        openmrs_client.get_statistics(),
+        return_exceptions=True
+    )
+    
+    # Check MongoDB service
+    if isinstance(mongo_stats, Exception):
+        logger.error("MongoDB health check failed", error=str(mongo_stats))
+        components.append({
+            "name": "mongodb",
+            "status": ServiceStatus.DOWN.value,
+            "details": {"error": str(mongo_stats)},
+            "last_check": checked_at
+        })
+        overall_status = ServiceStatus.DEGRADED
+    else:
+        mongo_status = (
+            ServiceStatus.OPERATIONAL 
+            if mongo_stats["connection_status"] == "connected" 
+            else ServiceStatus.DOWN
+        )
         
-        # Check MongoDB service
-        try:
-            mongo_stats = await mongo_service.get_statistics()
-            mongo_status = (
-                ServiceStatus.OPERATIONAL 
-                if mongo_stats["connection_status"] == "connected" 
-                else ServiceStatus.DOWN
-            )
-            
-            components.append(ComponentHealth(
-                name="mongodb",
-                status=mongo_status,
-                details={
-                    "connection_status": mongo_stats["connection_status"],
-                    "total_records": mongo_stats["total_records"]
-                }
-            ))
-            
-            if mongo_status != ServiceStatus.OPERATIONAL:
-                overall_status = ServiceStatus.DEGRADED
-                
-        except Exception as e:
-            logger.error("MongoDB health check failed", error=str(e))
-            components.append(ComponentHealth(
-                name="mongodb",
-                status=ServiceStatus.DOWN,
-                details={"error": str(e)}
-            ))
-            overall_status = ServiceStatus.DEGRADED
+        components.append({
+            "name": "mongodb",
+            "status": mongo_status.value,
+            "details": {
+                "connection_status": mongo_stats["connection_status"],
+                "total_records": mongo_stats["total_records"]
+            },
+            "last_check": checked_at
+        })
         
-        # Check OpenMRS client
-        try:
-            openmrs_stats = await openmrs_client.get_statistics()
-            openmrs_status = (
-                ServiceStatus.OPERATIONAL 
-                if openmrs_stats["initialized"] 
-                else ServiceStatus.DOWN
-            )
-            
-            components.append(ComponentHealth(
-                name="openmrs_client",
-                status=openmrs_status,
-                details={
-                    "initialized": openmrs_stats["initialized"],
-                    "base_url": openmrs_stats["base_url"],
-                    "successful_submissions": openmrs_stats["successful_submissions"]
-                }
-            ))
-            
-            if openmrs_status != ServiceStatus.OPERATIONAL:
-                overall_status = ServiceStatus.DEGRADED
-                
-        except Exception as e:
-            logger.error("OpenMRS client health check failed", error=str(e))
-            components.append(ComponentHealth(
-                name="openmrs_client",
-                status=ServiceStatus.DOWN,
-                details={"error": str(e)}
-            ))
+        if mongo_status != ServiceStatus.OPERATIONAL:
             overall_status = ServiceStatus.DEGRADED
-        
-        response = HealthCheckResponse(
-            success=overall_status in [ServiceStatus.OPERATIONAL, ServiceStatus.DEGRADED],
-            message=f"Health check completed - status: {overall_status.value}",
-            overall_status=overall_status,
-            components=components,
-            version="1.0.0",
-            environment=settings.environment,
-            request_id=request_id
+    
+    # Check OpenMRS client
+    if isinstance(openmrs_stats, Exception):
+        logger.error("OpenMRS client health check failed", error=str(openmrs_stats))
+        components.append({
+            "name": "openmrs_client",
+            "status": ServiceStatus.DOWN.value,
+            "details": {"error": str(openmrs_stats)},
+            "last_check": checked_at
+        })
+        overall_status = ServiceStatus.DEGRADED
+    else:
+        openmrs_status = (
+            ServiceStatus.OPERATIONAL 
+            if openmrs_stats["initialized"] 
+            else ServiceStatus.DOWN
         )
         
+        components.append({
+            "name": "openmrs_client",
+            "status": openmrs_status.value,
+            "details": {
+                "initialized": openmrs_stats["initialized"],
+                "base_url": openmrs_stats["base_url"],
+                "successful_submissions": openmrs_stats["successful_submissions"]
+            },
+            "last_check": checked_at
+        })
+        
+        if openmrs_status != ServiceStatus.OPERATIONAL:
+            overall_status = ServiceStatus.DEGRADED
+    
+    if INFO_ENABLED:
         logger.info(
             "Health check completed",
             overall_status=overall_status.value,
             component_count=len(components)
         )
-        
-        return response
+    
+    return overall_status, components
 
 
@@ -0,0 +1,84 @@
+"""
+Internal endpoints for service-to-service data transfer.
+
+Routes in this module exchange TM2 records as msgpack rather than JSON
+and are not intended for external clients. Every route requires the
+configured ``API_KEY`` in the ``X-API-Key`` header; without a configured
+key the routes are disabled.
+"""
+
+import secrets
+from typing import Optional
+
+import msgpack
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, Security
+from fastapi.security import APIKeyHeader
+
+from app.core.config import get_settings
+from app.core.ids import get_request_id
+from app.core.logging import get_logger, RequestIDContext
+from app.core.lifespan import get_mongo_service
+from app.services.mongo_service import MongoService
+from app.models.tm2_data import TM2ProcessedRecord
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+async def require_api_key(api_key: Optional[str] = Security(api_key_header)) -> None:
+    """
+    Reject requests that do not carry the configured API key.
+    
+    Args:
+        api_key: Value of the ``X-API-Key`` header, if sent
+        
+    Raises:
+        HTTPException: 403 if no API key is configured, 401 if the header
+            is missing or does not match
+    """
+    if not settings.api_key:
+        raise HTTPException(status_code=403, detail="Internal API is disabled")
+    
+    if api_key is None or not secrets.compare_digest(api_key, settings.api_key):
+        logger.warning("Rejected internal API request with invalid API key")
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+
+# Initialize router; every route requires the API key
+router = APIRouter(dependencies=[Depends(require_api_key)])
+
+
+@router.get(
+    "/records/pending",
+    summary="Export pending records as msgpack",
+    description="Return records awaiting OpenMRS submission as a msgpack array of wire-encoded records",
+    response_class=Response
+)
+async def export_pending_records(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=10000, description="Maximum number of records"),
+    mongo_service: MongoService = Depends(get_mongo_service)
+) -> Response:
+    """
+    Export pending records for another service.
+    
+    Each element of the returned array is a record as produced by
+    ``TM2ProcessedRecord.to_wire`` and can be decoded with
+    ``TM2ProcessedRecord.from_wire``.
+    """
+    request_id = get_request_id(request)
+    
+    with RequestIDContext(request_id):
+        documents = await mongo_service.get_pending_records(limit=limit)
+        payload = msgpack.packb([
+            TM2ProcessedRecord.from_document(document).to_wire()
+            for document in documents
+        ])
+        
+        logger.info("Pending records exported", record_count=len(documents))
+        
+        return Response(content=payload, media_type=MSGPACK_MEDIA_TYPE)
@@ -0,0 +1,111 @@
+"""
+In-memory Bloom filter for record hashes.
+
+This module provides compact set-membership filters used to skip
+database duplicate checks for records that have never been seen.
+"""
+
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter keyed by hex SHA-256 record hashes.
+
+    Bit positions are derived from the record hash itself with double
+    hashing, so no extra hashing is done per lookup. A negative answer is
+    exact; a positive answer must be confirmed against the database.
+    """
+
+    __slots__ = ("_bits", "_size", "_hash_count", "capacity", "error_rate", "count")
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Size the filter for an expected number of entries.
+
+        Args:
+            capacity: Number of entries the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._size = max(size, 8)
+        self._hash_count = max(round(self._size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, record_hash: str):
+        """Yield the bit positions for a hex record hash."""
+        first = int(record_hash[:16], 16)
+        step = int(record_hash[16:32], 16) | 1
+        for i in range(self._hash_count):
+            yield (first + i * step) % self._size
+
+    def add(self, record_hash: str) -> None:
+        """
+        Add a record hash to the filter.
+
+        Args:
+            record_hash: Hex SHA-256 record hash
+        """
+        bits = self._bits
+        for position in self._positions(record_hash):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, record_hash: str) -> bool:
+        """Check whether a record hash may have been added."""
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(record_hash)
+        )
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows by stacking fixed-size layers.
+
+    When the newest layer reaches its capacity a new layer is added with
+    twice the capacity and a tighter error rate, so the overall
+    false-positive rate stays bounded however many hashes are stored.
+    """
+
+    __slots__ = ("_layers", "count")
+
+    GROWTH_FACTOR = 2
+    ERROR_TIGHTENING = 0.5
+
+    def __init__(self, initial_capacity: int, error_rate: float):
+        """
+        Create the filter with a single layer.
+
+        Args:
+            initial_capacity: Number of entries the first layer is sized for
+            error_rate: Target overall false-positive rate
+        """
+        first_error_rate = error_rate * (1 - self.ERROR_TIGHTENING)
+        self._layers = [BloomFilter(initial_capacity, first_error_rate)]
+        self.count = 0
+
+    def add(self, record_hash: str) -> None:
+        """
+        Add a record hash, adding a new layer when the current one is full.
+
+        Args:
+            record_hash: Hex SHA-256 record hash
+        """
+        layer = self._layers[-1]
+        if layer.count >= layer.capacity:
+            layer = BloomFilter(
+                layer.capacity * self.GROWTH_FACTOR,
+                layer.error_rate * self.ERROR_TIGHTENING
+            )
+            self._layers.append(layer)
+        layer.add(record_hash)
+        self.count += 1
+
+    def __contains__(self, record_hash: str) -> bool:
+        """Check whether a record hash may have been added to any layer."""
+        return any(record_hash in layer for layer in reversed(self._layers))
@@ -8,7 +8,7 @@ environment variable loading and validation.
 from functools import lru_cache
 from typing import Optional
 
-from pydantic import Field
+from pydantic.fields import Field
 from pydantic_settings import BaseSettings
 
 
@@ -32,6 +32,22 @@ class Settings(BaseSettings):
         default="tm2_records",
         description="MongoDB collection name"
     )
+    mongo_max_pool_size: int = Field(
+        default=200,
+        description="Maximum MongoDB connections kept in the pool"
+    )
+    mongo_min_pool_size: int = Field(
+        default=10,
+        description="Minimum MongoDB connections kept open in the pool"
+    )
+    mongo_max_idle_time_ms: int = Field(
+        default=60000,
+        description="Milliseconds an idle MongoDB connection is kept before closing"
+    )
+    mongo_server_selection_timeout_ms: int = Field(
+        default=5000,
+        description="Milliseconds to wait for a MongoDB server to become available"
+    )
     
     # OpenMRS Configuration
     openmrs_base_url: str = Field(
@@ -46,6 +62,38 @@ class Settings(BaseSettings):
         default="Admin123",
         description="OpenMRS API password"
     )
+    openmrs_max_connections: int = Field(
+        default=200,
+        description="Maximum concurrent HTTP connections to OpenMRS"
+    )
+    openmrs_max_keepalive_connections: int = Field(
+        default=50,
+        description="Maximum idle keep-alive HTTP connections to OpenMRS"
+    )
+    openmrs_timeout_seconds: float = Field(
+        default=30.0,
+        description="Seconds an OpenMRS request may take overall"
+    )
+    openmrs_connect_timeout_seconds: float = Field(
+        default=5.0,
+        description="Seconds allowed to open a new connection to OpenMRS"
+    )
+    openmrs_keepalive_expiry: float = Field(
+        default=60.0,
+        description="Seconds an idle keep-alive connection to OpenMRS is kept open"
+    )
+    openmrs_http2: bool = Field(
+        default=True,
+        description="Use HTTP/2 so concurrent OpenMRS requests share connections"
+    )
+    openmrs_mock_store_size: int = Field(
+        default=10_000,
+        description="Most recent entities of each kind kept by the mock OpenMRS client"
+    )
+    openmrs_concurrency: int = Field(
+        default=32,
+        description="Maximum concurrent OpenMRS record submissions"
+    )
     
     # Application Configuration
     environment: str = Field(
@@ -56,6 +104,18 @@ class Settings(BaseSettings):
         default="INFO",
         description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)"
     )
+    simulated_latency_seconds: float = Field(
+        default=0.0,
+        description="Delay added to mock service connections to simulate network latency (0 disables it)"
+    )
+    server_keepalive_timeout: int = Field(
+        default=30,
+        description="Seconds an idle client keep-alive connection is held open by the server"
+    )
+    server_limit_concurrency: int = Field(
+        default=1000,
+        description="Maximum concurrent connections before the server answers 503"
+    )
     
     # Security Configuration
     jwt_secret_key: Optional[str] = Field(
@@ -64,7 +124,7 @@ class Settings(BaseSettings):
     )
     api_key: Optional[str] = Field(
         default=None,
-        description="API key for external service authentication"
+        description="API key for external service authentication; required by the /internal routes, which are disabled without it"
     )
     
     # Processing Configuration
@@ -72,6 +132,14 @@ class Settings(BaseSettings):
         default=100,
         description="Batch size for processing records"
     )
+    ingest_queue_size: int = Field(
+        default=4,
+        description="Parsed batches buffered ahead of validation and storage"
+    )
+    ingest_cache_ttl_seconds: int = Field(
+        default=86400,
+        description="Seconds a completed ingestion result is returned for re-uploads of the same file (0 disables it)"
+    )
     max_file_size_mb: int = Field(
         default=50,
         description="Maximum file size in MB"
@@ -80,6 +148,26 @@ class Settings(BaseSettings):
         default=300,
         description="Processing timeout in seconds"
     )
+    validation_workers: int = Field(
+        default=1,
+        description="Worker processes used to validate record batches (1 validates in-process, which is faster unless batches are very large)"
+    )
+    dedup_filter_capacity: int = Field(
+        default=1_000_000,
+        description="Number of record hashes the first duplicate pre-check filter layer is sized for; the filter grows past it"
+    )
+    dedup_filter_error_rate: float = Field(
+        default=1e-4,
+        description="Target false-positive rate of the duplicate pre-check filter"
+    )
+    dedup_cache_size: int = Field(
+        default=100_000,
+        description="Most recently stored or confirmed record hashes answered without a database lookup"
+    )
+    max_reported_errors: int = Field(
+        default=100,
+        description="Maximum number of error messages kept in a processing summary"
+    )
     
     class Config:
         """Pydantic configuration."""
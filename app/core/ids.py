@@ -0,0 +1,113 @@
+"""
+Request identifier generation.
+
+This module provides cheap, unique request identifiers shaped like
+UUIDv7 values, drawing randomness once per process instead of per call,
+and the middleware that assigns one identifier to each HTTP request.
+"""
+
+import itertools
+import os
+import time
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 62-bit counter occupying the UUID's rand_b field
+_COUNTER_MASK = (1 << 62) - 1
+
+# Millisecond timestamp, version 7 and RFC 4122 variant bits, and the
+# counter occupying the rand_b field; both are set by _reseed
+_PREFIX = 0
+_counter = itertools.count()
+
+
+def _reseed() -> None:
+    """
+    Draw a fresh identifier prefix and counter start.
+    
+    Runs at import and again in every forked child, so workers forked
+    from a preloaded parent do not share the parent's identifier space.
+    """
+    global _PREFIX, _counter
+    
+    _PREFIX = (
+        ((time.time_ns() // 1_000_000) & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | int.from_bytes(os.urandom(2), "big") >> 4 << 64
+        | 0b10 << 62
+    )
+    # itertools.count is advanced atomically under the GIL
+    _counter = itertools.count(int.from_bytes(os.urandom(8), "big") & _COUNTER_MASK)
+
+
+_reseed()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+# Response header echoing the request identifier to clients
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+def next_request_id() -> str:
+    """
+    Get the next unique request identifier.
+    
+    Identifiers combine the process start timestamp, random bits drawn once
+    per process and a monotonically increasing counter, formatted as a
+    canonical UUID string.
+    
+    Returns:
+        str: UUIDv7-formatted request identifier
+    """
+    value = _PREFIX | (next(_counter) & _COUNTER_MASK)
+    digits = value.to_bytes(16, "big").hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def get_request_id(request: Request) -> str:
+    """
+    Get the identifier assigned to a request.
+    
+    Falls back to a fresh identifier when the request did not pass
+    through ``RequestIDMiddleware``.
+    
+    Args:
+        request: Incoming HTTP request
+        
+    Returns:
+        str: Request identifier
+    """
+    return request.scope.get("state", {}).get("request_id") or next_request_id()
+
+
+class RequestIDMiddleware:
+    """
+    ASGI middleware assigning one identifier to each HTTP request.
+    
+    The identifier is stored in the request state, where endpoints and
+    exception handlers read it with ``get_request_id``, and returned in
+    the ``X-Request-ID`` response header. Implemented as plain ASGI
+    rather than ``BaseHTTPMiddleware`` so responses are not re-wrapped.
+    """
+    
+    __slots__ = ("app",)
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = next_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_request_id)
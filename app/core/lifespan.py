@@ -14,6 +14,7 @@ from app.core.config import get_settings
 from app.core.logging import setup_logging, get_logger
 from app.services.mongo_service import MongoService
 from app.services.openmrs_client import OpenMRSRestClient
+from app.services.ingestion_service import TM2IngestionService
 
 # Initialize logging first
 setup_logging()
@@ -22,6 +23,7 @@ logger = get_logger(__name__)
 # Global service instances
 _mongo_service: MongoService = None
 _openmrs_client: OpenMRSRestClient = None
+_ingestion_service: TM2IngestionService = None
 
 settings = get_settings()
 
@@ -34,7 +36,7 @@ async def startup_event() -> None:
     It initializes database connections, external service clients, and other
     resources needed for the application to function properly.
     """
-    global _mongo_service, _openmrs_client
+    global _mongo_service, _openmrs_client, _ingestion_service
     
     logger.info("Starting TM2 Healthcare Data Ingestion Service")
     
@@ -59,6 +61,11 @@ async def startup_event() -> None:
         await _openmrs_client.initialize()
         logger.info("OpenMRS client initialized successfully")
         
+        # Initialize ingestion service shared by all requests
+        _ingestion_service = TM2IngestionService(_mongo_service, _openmrs_client)
+        await _ingestion_service.load_seen_hashes()
+        logger.info("TM2 ingestion service initialized successfully")
+        
         # Log startup completion
         logger.info(
             "Service startup completed successfully",
@@ -80,11 +87,16 @@ async def shutdown_event() -> None:
     It properly closes database connections, cleans up resources,
     and logs the shutdown process.
     """
-    global _mongo_service, _openmrs_client
+    global _mongo_service, _openmrs_client, _ingestion_service
     
     logger.info("Starting TM2 Healthcare Data Ingestion Service shutdown")
     
     try:
+        # Release the ingestion service before the services it depends on
+        if _ingestion_service:
+            await _ingestion_service.close()
+            _ingestion_service = None
+        
         # Cleanup OpenMRS client
         if _openmrs_client:
             logger.info("Closing OpenMRS client connection")
@@ -168,4 +180,24 @@ def get_openmrs_client() -> OpenMRSRestClient:
     if _openmrs_client is None:
         raise RuntimeError("OpenMRS client not initialized. Check application startup.")
     
-    return _openmrs_client
\ No newline at end of file
+    return _openmrs_client
+
+
+def get_ingestion_service() -> TM2IngestionService:
+    """
+    Get the global TM2 ingestion service instance.
+    
+    The ingestion service is built once during application startup on top
+    of the shared MongoDB service and OpenMRS client. It should be used as
+    a dependency in FastAPI routes.
+    
+    Returns:
+        TM2IngestionService: Initialized ingestion service instance
+        
+    Raises:
+        RuntimeError: If the service is not initialized
+    """
+    if _ingestion_service is None:
+        raise RuntimeError("Ingestion service not initialized. Check application startup.")
+    
+    return _ingestion_service
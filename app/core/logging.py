@@ -10,6 +10,7 @@ import logging.config
 import sys
 from typing import Any, Dict
 
+import orjson
 import structlog
 from pythonjsonlogger import jsonlogger
 
@@ -17,6 +18,65 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
+# Effective log level, resolved once. The level flags let hot paths skip
+# building log keyword arguments for records that would be filtered out.
+LOG_LEVEL = getattr(logging, settings.log_level.upper())
+DEBUG_ENABLED = LOG_LEVEL <= logging.DEBUG
+INFO_ENABLED = LOG_LEVEL <= logging.INFO
+ERROR_ENABLED = LOG_LEVEL <= logging.ERROR
+
+# Service context added to every log entry. Settings are cached for the
+# process lifetime, so this is built once rather than per record.
+_STATIC_CONTEXT = {
+    "service": "tm2-healthcare-service",
+    "version": "1.0.0",
+    "environment": settings.environment
+}
+
+
+# Naive datetimes in log records are UTC throughout the service
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def orjson_dumps_bytes(obj: Any, default: Any = None, **kwargs: Any) -> bytes:
+    """
+    Serialize a log record to UTF-8 JSON bytes with orjson.
+    
+    Args:
+        obj: Log record to serialize
+        default: Fallback for objects orjson cannot serialize natively
+        **kwargs: Ignored stdlib ``json.dumps`` options
+        
+    Returns:
+        bytes: JSON-encoded log record
+    """
+    return orjson.dumps(obj, default=default or str, option=ORJSON_OPTIONS)
+
+
+def orjson_dumps(obj: Any, default: Any = None, **kwargs: Any) -> str:
+    """
+    Serialize a log record to a JSON string with orjson.
+    
+    Args:
+        obj: Log record to serialize
+        default: Fallback for objects orjson cannot serialize natively
+        **kwargs: Ignored stdlib ``json.dumps`` options
+        
+    Returns:
+        str: JSON-encoded log record
+    """
+    return orjson_dumps_bytes(obj, default).decode()
+
+
+class OrjsonFormatter(jsonlogger.JsonFormatter):
+    """
+    JSON formatter for standard library records serialized with orjson.
+    """
+    
+    def jsonify_log_record(self, log_record: Dict[str, Any]) -> str:
+        """Serialize the log record with orjson instead of the json module."""
+        return orjson_dumps(log_record, default=self.json_default)
+
 
 class HealthcareContextProcessor:
     """
@@ -35,11 +95,7 @@ class HealthcareContextProcessor:
         Returns:
             Dict: Enhanced event dictionary with context
         """
-        event_dict.update({
-            "service": "tm2-healthcare-service",
-            "version": "1.0.0",
-            "environment": settings.environment
-        })
+        event_dict.update(_STATIC_CONTEXT)
         return event_dict
 
 
@@ -57,7 +113,7 @@ def setup_logging() -> None:
         "disable_existing_loggers": False,
         "formatters": {
             "json": {
-                "()": jsonlogger.JsonFormatter,
+                "()": OrjsonFormatter,
                 "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
                 "datefmt": "%Y-%m-%d %H:%M:%S"
             },
@@ -101,26 +157,30 @@ def setup_logging() -> None:
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         HealthcareContextProcessor(),
-        structlog.processors.CallsiteParameterAdder(
-            parameters=[structlog.processors.CallsiteParameter.FUNC_NAME]
-        ),
     ]
     
     if settings.environment == "production":
-        processors.append(structlog.processors.JSONRenderer())
+        # Render straight to bytes and write them to stdout's binary buffer,
+        # skipping print() and the text encoding layer
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson_dumps_bytes))
+        logger_factory = structlog.BytesLoggerFactory()
     else:
+        # Callsite lookup inspects the stack on every record, so it is
+        # only enabled outside production
         processors.extend([
+            structlog.processors.CallsiteParameterAdder(
+                parameters=[structlog.processors.CallsiteParameter.FUNC_NAME]
+            ),
             structlog.dev.set_exc_info,
             structlog.dev.ConsoleRenderer(colors=True)
         ])
+        logger_factory = structlog.PrintLoggerFactory()
     
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, settings.log_level.upper())
-        ),
+        wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True
     )
 
@@ -138,12 +198,30 @@ def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
 
+def log_exception(logger: structlog.BoundLogger, message: str, **kwargs: Any) -> None:
+    """
+    Log an error with the currently handled exception attached.
+    
+    The exception info is only captured when ERROR records are enabled,
+    so no traceback is rendered for records that would be dropped.
+    
+    Args:
+        logger: Logger instance
+        message: Log message
+        **kwargs: Additional structured log fields
+    """
+    if ERROR_ENABLED:
+        logger.error(message, exc_info=sys.exc_info(), **kwargs)
+
+
 # Request ID context management
 class RequestIDContext:
     """
     Context manager for request ID tracking in logs.
     """
     
+    __slots__ = ("request_id",)
+    
     def __init__(self, request_id: str):
         self.request_id = request_id
     
@@ -161,10 +239,19 @@ class HealthcareOperationContext:
     Context manager for healthcare operation tracking in logs.
     """
     
+    __slots__ = ("operation", "patient_id", "record_count", "_unbind")
+    
     def __init__(self, operation: str, patient_id: str = None, record_count: int = None):
         self.operation = operation
         self.patient_id = patient_id
         self.record_count = record_count
+        
+        # Keys bound on enter, computed once so exit does not rebuild them
+        self._unbind = (
+            ("healthcare_operation",)
+            + (("patient_id",) if patient_id else ())
+            + (("record_count",) if record_count else ())
+        )
     
     def __enter__(self):
         context_vars = {"healthcare_operation": self.operation}
@@ -177,10 +264,4 @@ class HealthcareOperationContext:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        vars_to_unbind = ["healthcare_operation"]
-        if self.patient_id:
-            vars_to_unbind.append("patient_id")
-        if self.record_count:
-            vars_to_unbind.append("record_count")
-        
-        structlog.contextvars.unbind_contextvars(*vars_to_unbind)
\ No newline at end of file
+        structlog.contextvars.unbind_contextvars(*self._unbind)
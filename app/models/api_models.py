@@ -6,13 +6,31 @@ request validation, response formatting, and error handling.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from functools import cached_property
+from typing import Annotated, Optional, List, Dict, Any, Union
 from enum import Enum
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic.config import ConfigDict
+from pydantic.dataclasses import dataclass
+from pydantic.fields import Field
+from pydantic.main import BaseModel
 
 
-class ProcessingStatus(str, Enum):
+# Shared non-negative count type, so every count field reuses one schema
+NonNegInt = Annotated[int, Field(ge=0)]
+
+# Shared configuration for response models. Status enums are plain Enums,
+# so every model holding one stores and emits the enum value instead.
+RESPONSE_CONFIG = ConfigDict(
+    use_enum_values=True,
+    frozen=True,
+    validate_assignment=False,
+    revalidate_instances='never',
+    extra='ignore'
+)
+
+
+class ProcessingStatus(Enum):
     """Status values for processing operations."""
     PENDING = "pending"
     PROCESSING = "processing"
@@ -21,7 +39,7 @@ class ProcessingStatus(str, Enum):
     PARTIAL = "partial"
 
 
-class ServiceStatus(str, Enum):
+class ServiceStatus(Enum):
     """Service health status values."""
     OPERATIONAL = "operational"
     DEGRADED = "degraded"
@@ -69,9 +87,10 @@ class APIResponse(BaseModel):
     Base response model for all API endpoints.
     
     Provides consistent structure for API responses including
-    success/error status, timestamps, and metadata.
+    success/error status, timestamps, and metadata. Responses are
+    immutable once built, so they are never revalidated or reassigned.
     """
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = RESPONSE_CONFIG
     
     success: bool = Field(
         ...,
@@ -97,75 +116,75 @@ class APIResponse(BaseModel):
 class ProcessingSummary(BaseModel):
     """
     Summary of file processing results.
+    
+    Summaries are immutable once built, so the derived rates are
+    computed on first access and cached.
     """
+    model_config = ConfigDict(frozen=True)
     
-    total_records: int = Field(
+    total_records: NonNegInt = Field(
         ...,
-        description="Total number of records in the file",
-        ge=0
+        description="Total number of records in the file"
     )
     
-    processed_records: int = Field(
+    processed_records: NonNegInt = Field(
         ...,
-        description="Number of successfully processed records",
-        ge=0
+        description="Number of successfully processed records"
     )
     
-    validated_records: int = Field(
+    validated_records: NonNegInt = Field(
         ...,
-        description="Number of records that passed validation",
-        ge=0
+        description="Number of records that passed validation"
     )
     
-    stored_records: int = Field(
+    stored_records: NonNegInt = Field(
         ...,
-        description="Number of records stored in database",
-        ge=0
+        description="Number of records stored in database"
     )
     
-    submitted_records: int = Field(
+    submitted_records: NonNegInt = Field(
         ...,
-        description="Number of records submitted to OpenMRS",
-        ge=0
+        description="Number of records submitted to OpenMRS"
     )
     
-    duplicate_records: int = Field(
+    duplicate_records: NonNegInt = Field(
         default=0,
-        description="Number of duplicate records skipped",
-        ge=0
+        description="Number of duplicate records skipped"
     )
     
-    validation_errors: int = Field(
+    validation_errors: NonNegInt = Field(
         default=0,
-        description="Number of validation errors",
-        ge=0
+        description="Number of validation errors"
     )
     
-    storage_errors: int = Field(
+    storage_errors: NonNegInt = Field(
         default=0,
-        description="Number of storage errors",
-        ge=0
+        description="Number of storage errors"
     )
     
-    submission_errors: int = Field(
+    submission_errors: NonNegInt = Field(
         default=0,
-        description="Number of submission errors",
-        ge=0
+        description="Number of submission errors"
     )
     
     errors: List[str] = Field(
         default_factory=list,
-        description="List of error messages"
+        description="First error messages, up to the configured limit"
     )
     
-    @property
+    errors_truncated: NonNegInt = Field(
+        default=0,
+        description="Number of further error messages not included in errors"
+    )
+    
+    @cached_property
     def success_rate(self) -> float:
         """Calculate overall success rate as percentage."""
         if self.total_records == 0:
             return 0.0
         return (self.submitted_records / self.total_records) * 100
     
-    @property
+    @cached_property
     def error_rate(self) -> float:
         """Calculate overall error rate as percentage."""
         if self.total_records == 0:
@@ -216,34 +235,29 @@ class DatabaseStatistics(BaseModel):
         description="Database connection status"
     )
     
-    total_records: int = Field(
+    total_records: NonNegInt = Field(
         ...,
-        description="Total number of records in database",
-        ge=0
+        description="Total number of records in database"
     )
     
-    submitted_records: int = Field(
+    submitted_records: NonNegInt = Field(
         ...,
-        description="Number of successfully submitted records",
-        ge=0
+        description="Number of successfully submitted records"
     )
     
-    failed_records: int = Field(
+    failed_records: NonNegInt = Field(
         ...,
-        description="Number of failed records",
-        ge=0
+        description="Number of failed records"
     )
     
-    pending_records: int = Field(
+    pending_records: NonNegInt = Field(
         ...,
-        description="Number of pending records",
-        ge=0
+        description="Number of pending records"
     )
     
-    collection_size: int = Field(
+    collection_size: NonNegInt = Field(
         ...,
-        description="Size of the main collection",
-        ge=0
+        description="Size of the main collection"
     )
     
     status_breakdown: Dict[str, int] = Field(
@@ -277,34 +291,29 @@ class OpenMRSStatistics(BaseModel):
         description="API username"
     )
     
-    requests_made: int = Field(
+    requests_made: NonNegInt = Field(
         ...,
-        description="Total number of API requests made",
-        ge=0
+        description="Total number of API requests made"
     )
     
-    successful_submissions: int = Field(
+    successful_submissions: NonNegInt = Field(
         ...,
-        description="Number of successful submissions",
-        ge=0
+        description="Number of successful submissions"
     )
     
-    failed_submissions: int = Field(
+    failed_submissions: NonNegInt = Field(
         ...,
-        description="Number of failed submissions",
-        ge=0
+        description="Number of failed submissions"
     )
     
-    patients_created: int = Field(
+    patients_created: NonNegInt = Field(
         ...,
-        description="Number of patients created",
-        ge=0
+        description="Number of patients created"
     )
     
-    concepts_created: int = Field(
+    concepts_created: NonNegInt = Field(
         ...,
-        description="Number of concepts created",
-        ge=0
+        description="Number of concepts created"
     )
     
     mock_entities: Dict[str, int] = Field(
@@ -323,58 +332,49 @@ class ServiceStatistics(BaseModel):
     Overall service statistics.
     """
     
-    files_processed: int = Field(
+    files_processed: NonNegInt = Field(
         ...,
-        description="Total number of files processed",
-        ge=0
+        description="Total number of files processed"
     )
     
-    records_processed: int = Field(
+    records_processed: NonNegInt = Field(
         ...,
-        description="Total number of records processed",
-        ge=0
+        description="Total number of records processed"
     )
     
-    records_validated: int = Field(
+    records_validated: NonNegInt = Field(
         ...,
-        description="Total number of records validated",
-        ge=0
+        description="Total number of records validated"
     )
     
-    records_stored: int = Field(
+    records_stored: NonNegInt = Field(
         ...,
-        description="Total number of records stored",
-        ge=0
+        description="Total number of records stored"
     )
     
-    records_submitted: int = Field(
+    records_submitted: NonNegInt = Field(
         ...,
-        description="Total number of records submitted",
-        ge=0
+        description="Total number of records submitted"
     )
     
-    validation_errors: int = Field(
+    validation_errors: NonNegInt = Field(
         ...,
-        description="Total validation errors",
-        ge=0
+        description="Total validation errors"
     )
     
-    storage_errors: int = Field(
+    storage_errors: NonNegInt = Field(
         ...,
-        description="Total storage errors",
-        ge=0
+        description="Total storage errors"
     )
     
-    submission_errors: int = Field(
+    submission_errors: NonNegInt = Field(
         ...,
-        description="Total submission errors",
-        ge=0
+        description="Total submission errors"
     )
     
-    duplicate_records: int = Field(
+    duplicate_records: NonNegInt = Field(
         ...,
-        description="Total duplicate records encountered",
-        ge=0
+        description="Total duplicate records encountered"
     )
 
 
@@ -422,7 +422,10 @@ class SystemStatus(APIResponse):
 
 # Error Response Models
 
-class ValidationError(BaseModel):
+# Error and health detail models are slotted Pydantic dataclasses: they are
+# validated like models but carry no per-instance __dict__
+@dataclass(slots=True)
+class ValidationError:
     """
     Individual validation error details.
     """
@@ -443,7 +446,8 @@ class ValidationError(BaseModel):
     )
 
 
-class ErrorDetail(BaseModel):
+@dataclass(slots=True)
+class ErrorDetail:
     """
     Detailed error information.
     """
@@ -493,7 +497,8 @@ class ErrorResponse(APIResponse):
 
 # Health Check Models
 
-class ComponentHealth(BaseModel):
+@dataclass(slots=True, config=ConfigDict(use_enum_values=True))
+class ComponentHealth:
     """
     Health status of individual service components.
     """
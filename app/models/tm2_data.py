@@ -1,15 +1,26 @@
 """
-Pydantic models for TM2 healthcare data validation and serialization.
+Data models for TM2 healthcare data validation and serialization.
 
 This module defines the data models for TM2 (Traditional Medicine Module 2) 
-records, including validation rules and transformation logic.
+records, including validation rules and transformation logic. Only raw CSV
+input is validated with Pydantic; records built internally after validation
+are plain slotted dataclasses.
 """
 
-from datetime import datetime
-from typing import Optional, Literal
-from enum import Enum
+import json
+import re
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Literal, Tuple
+from enum import Enum, IntEnum
 
-from pydantic import BaseModel, Field, validator, ConfigDict
+import msgpack
+from pydantic.config import ConfigDict
+from pydantic.fields import Field
+from pydantic.functional_validators import field_validator
+from pydantic.main import BaseModel
 
 
 class SystemType(str, Enum):
@@ -33,6 +44,192 @@ class SeverityLevel(str, Enum):
     UNKNOWN = "Unknown"
 
 
+class SystemTypeCode(IntEnum):
+    """
+    Stable integer codes for system types in stored and serialized records.
+    
+    Member names match SystemType; values must never be reassigned.
+    """
+    AYURVEDA = 0
+    SIDDHA = 1
+    UNANI = 2
+    HOMEOPATHY = 3
+    TRADITIONAL_CHINESE_MEDICINE = 4
+    NATUROPATHY = 5
+    YOGA = 6
+    OTHER = 7
+
+
+class SeverityCode(IntEnum):
+    """
+    Stable integer codes for severity levels in stored and serialized records.
+    
+    Member names match SeverityLevel; values must never be reassigned.
+    """
+    MILD = 0
+    MODERATE = 1
+    SEVERE = 2
+    CRITICAL = 3
+    UNKNOWN = 4
+
+
+# TM2RawRecord format rules, compiled once at import. They are also used
+# by the ingestion service to screen whole CSV columns with fullmatch.
+# IDs need at least one letter or digit, so "___" or "-" are rejected.
+TM2_CODE_PATTERN = re.compile(r"TM2\..{0,16}", re.DOTALL)
+ID_PATTERN = re.compile(r"(?=[\w-]*[^\W_])[\w-]{1,50}")
+
+# Lowercase spellings mapped to their enum values, built once at import
+SYSTEM_TYPE_ALIASES: Dict[str, SystemType] = {
+    "ayurveda": SystemType.AYURVEDA,
+    "ayurved": SystemType.AYURVEDA,
+    "siddha": SystemType.SIDDHA,
+    "siddh": SystemType.SIDDHA,
+    "unani": SystemType.UNANI,
+    "yunani": SystemType.UNANI,
+    "homeopathy": SystemType.HOMEOPATHY,
+    "homoeopathy": SystemType.HOMEOPATHY,
+    "homeo": SystemType.HOMEOPATHY,
+    "tcm": SystemType.TRADITIONAL_CHINESE_MEDICINE,
+    "traditional chinese medicine": SystemType.TRADITIONAL_CHINESE_MEDICINE,
+    "chinese medicine": SystemType.TRADITIONAL_CHINESE_MEDICINE,
+    "naturopathy": SystemType.NATUROPATHY,
+    "naturo": SystemType.NATUROPATHY,
+    "yoga": SystemType.YOGA,
+}
+
+SEVERITY_ALIASES: Dict[str, SeverityLevel] = {
+    "mild": SeverityLevel.MILD,
+    "light": SeverityLevel.MILD,
+    "low": SeverityLevel.MILD,
+    "moderate": SeverityLevel.MODERATE,
+    "medium": SeverityLevel.MODERATE,
+    "severe": SeverityLevel.SEVERE,
+    "high": SeverityLevel.SEVERE,
+    "serious": SeverityLevel.SEVERE,
+    "critical": SeverityLevel.CRITICAL,
+    "very severe": SeverityLevel.CRITICAL,
+    "life threatening": SeverityLevel.CRITICAL,
+}
+
+
+def normalize_system_type(value: Any) -> Any:
+    """
+    Normalize a system type to its enum value.
+    
+    Args:
+        value: Raw system type
+        
+    Returns:
+        SystemType: Matching system type, OTHER for unrecognized strings;
+        non-string values are returned unchanged
+    """
+    if isinstance(value, str):
+        return SYSTEM_TYPE_ALIASES.get(value.lower().strip(), SystemType.OTHER)
+    
+    return value
+
+
+def normalize_severity(value: Any) -> Any:
+    """
+    Normalize a severity level to its enum value.
+    
+    Args:
+        value: Raw severity level
+        
+    Returns:
+        SeverityLevel: Matching severity level, UNKNOWN for unrecognized
+        strings; non-string values are returned unchanged
+    """
+    if isinstance(value, str):
+        return SEVERITY_ALIASES.get(value.lower().strip(), SeverityLevel.UNKNOWN)
+    
+    return value
+
+
+# Enum codes mapped to and from their display labels
+SYSTEM_TYPE_CODES: Dict[SystemType, SystemTypeCode] = {
+    SystemType[code.name]: code for code in SystemTypeCode
+}
+SEVERITY_CODES: Dict[SeverityLevel, SeverityCode] = {
+    SeverityLevel[code.name]: code for code in SeverityCode
+}
+CODE_TO_SYSTEM_TYPE: Dict[int, SystemType] = {
+    code: label for label, code in SYSTEM_TYPE_CODES.items()
+}
+CODE_TO_SEVERITY: Dict[int, SeverityLevel] = {
+    code: label for label, code in SEVERITY_CODES.items()
+}
+
+
+TM2_MAPPINGS_FILE = Path(__file__).resolve().parents[2] / "data" / "tm2_mappings.json"
+
+
+def _load_icd11_categories(path: Path) -> Dict[str, str]:
+    """
+    Load the ICD-11 category of each known TM2 code.
+    
+    The category is the ICD-11 stem code of the mapped foundation entity,
+    i.e. the foundation ID without its extension after the dot.
+    
+    Args:
+        path: TM2 mappings JSON file
+        
+    Returns:
+        Dict: TM2 codes mapped to ICD-11 categories, empty if the file is missing
+    """
+    if not path.is_file():
+        return {}
+    
+    with path.open(encoding="utf-8") as mappings_file:
+        mappings = json.load(mappings_file).get("tm2_mappings", [])
+    
+    return {
+        mapping["tm2_code"]: mapping["icd11_foundation_id"].split(".", 1)[0]
+        for mapping in mappings
+        if mapping.get("tm2_code") and mapping.get("icd11_foundation_id")
+    }
+
+
+# Known TM2 codes mapped to ICD-11 categories, loaded once at import so
+# deriving a record's category is a single dict lookup
+TM2_CODE_TO_ICD11_CATEGORY = _load_icd11_categories(TM2_MAPPINGS_FILE)
+
+
+def _to_timestamp(value: datetime) -> msgpack.Timestamp:
+    """Convert a naive UTC datetime to a msgpack timestamp."""
+    return msgpack.Timestamp.from_datetime(value.replace(tzinfo=timezone.utc))
+
+
+def _from_timestamp(value: msgpack.Timestamp) -> datetime:
+    """Convert a msgpack timestamp back to a naive UTC datetime."""
+    return value.to_datetime().replace(tzinfo=None)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Get the field names of a dataclass type, computed once per type."""
+    return tuple(f.name for f in fields(cls))
+
+
+def asdict_fast(obj: Any) -> Dict[str, Any]:
+    """
+    Convert a dataclass instance to a dictionary of its fields.
+    
+    Unlike ``dataclasses.asdict`` this is a shallow conversion: field
+    values are not recursed into or copied. None fields are kept, so the
+    result has the same keys, in the same order, as the documents
+    ``validate_records`` builds for storage.
+    
+    Args:
+        obj: Dataclass instance
+        
+    Returns:
+        Dict: Field names mapped to values
+    """
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+
 class TM2RawRecord(BaseModel):
     """
     Raw TM2 record as received from CSV file input.
@@ -92,305 +289,264 @@ class TM2RawRecord(BaseModel):
         example="DOC001"
     )
     
-    @validator('tm2_code')
-    def validate_tm2_code(cls, v):
+    @field_validator('tm2_code')
+    @classmethod
+    def validate_tm2_code(cls, v: str) -> str:
         """Validate TM2 code format."""
-        if not v.startswith('TM2.'):
+        if not TM2_CODE_PATTERN.fullmatch(v):
             raise ValueError('TM2 code must start with "TM2."')
         return v.upper()
     
-    @validator('patient_id', 'practitioner_id')
-    def validate_id_format(cls, v):
+    @field_validator('patient_id', 'practitioner_id')
+    @classmethod
+    def validate_id_format(cls, v: str) -> str:
         """Validate ID format (alphanumeric and underscores only)."""
-        if not v.replace('_', '').replace('-', '').isalnum():
+        if not ID_PATTERN.fullmatch(v):
             raise ValueError('ID must contain only alphanumeric characters, hyphens, and underscores')
         return v.upper()
 
 
-class TM2ProcessedRecord(BaseModel):
+# Records are validated once, at the CSV ingress boundary, against the
+# TM2RawRecord rules. Everything downstream - processed records, stored
+# documents and records read back from MongoDB - is trusted and built
+# without revalidation.
+@dataclass(slots=True)
+class TM2ProcessedRecord:
     """
     Processed TM2 record after validation and transformation.
     
     This model represents the cleaned and validated data that will be
-    stored in MongoDB and submitted to OpenMRS.
+    stored in MongoDB and submitted to OpenMRS. Instances are built from
+    a validated TM2RawRecord, so fields are not revalidated. It is a
+    slotted dataclass rather than a Pydantic model because it is built
+    once per row on the CSV to MongoDB path; Pydantic stays at the CSV
+    and API boundaries.
+    
+    Attributes:
+        patient_id: Unique patient identifier
+        tm2_code: Traditional Medicine Module 2 code from ICD-11
+        condition_name: Name of the medical condition
+        system_type: Traditional medicine system
+        severity: Condition severity level
+        diagnosis_date: Date of diagnosis
+        practitioner_id: Healthcare practitioner identifier
+        created_at: Record creation timestamp
+        source_file: Source filename for audit trail
+        icd11_category: ICD-11 category derived from TM2 code
+        traditional_diagnosis: Traditional medicine diagnosis in native terminology
     """
-    model_config = ConfigDict(str_strip_whitespace=True)
-    
-    patient_id: str = Field(
-        ...,
-        description="Unique patient identifier",
-        min_length=1,
-        max_length=50,
-        example="PAT001"
-    )
-    
-    tm2_code: str = Field(
-        ...,
-        description="Traditional Medicine Module 2 code from ICD-11",
-        min_length=1,
-        max_length=20,
-        example="TM2.A01.01"
-    )
-    
-    condition_name: str = Field(
-        ...,
-        description="Name of the medical condition",
-        min_length=1,
-        max_length=200,
-        example="Chronic Insomnia"
-    )
-    
-    system_type: SystemType = Field(
-        ...,
-        description="Traditional medicine system (validated enum)"
-    )
-    
-    severity: SeverityLevel = Field(
-        ...,
-        description="Condition severity level (validated enum)"
-    )
-    
-    diagnosis_date: datetime = Field(
-        ...,
-        description="Date of diagnosis (parsed datetime)"
-    )
-    
-    practitioner_id: str = Field(
-        ...,
-        description="Healthcare practitioner identifier",
-        min_length=1,
-        max_length=50,
-        example="DOC001"
-    )
-    
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Record creation timestamp"
-    )
-    
-    source_file: Optional[str] = Field(
-        default=None,
-        description="Source filename for audit trail",
-        max_length=255
-    )
+    patient_id: str
+    tm2_code: str
+    condition_name: str
+    system_type: SystemType
+    severity: SeverityLevel
+    diagnosis_date: datetime
+    practitioner_id: str
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    source_file: Optional[str] = None
     
     # Additional processed fields
-    icd11_category: Optional[str] = Field(
-        default=None,
-        description="ICD-11 category derived from TM2 code",
-        max_length=100
-    )
-    
-    traditional_diagnosis: Optional[str] = Field(
-        default=None,
-        description="Traditional medicine diagnosis in native terminology",
-        max_length=500
-    )
+    icd11_category: Optional[str] = None
+    traditional_diagnosis: Optional[str] = None
     
-    @validator('system_type', pre=True)
-    def normalize_system_type(cls, v):
-        """Normalize system type to enum value."""
-        if isinstance(v, str):
-            # Try to match common variations
-            v_lower = v.lower().strip()
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "TM2ProcessedRecord":
+        """
+        Build a processed record from a stored document, ignoring storage fields.
+        
+        Stored documents were validated before they were inserted, so the
+        record is built without revalidating them.
+        
+        Args:
+            document: Stored record document
             
-            if v_lower in ['ayurveda', 'ayurved']:
-                return SystemType.AYURVEDA
-            elif v_lower in ['siddha', 'siddh']:
-                return SystemType.SIDDHA
-            elif v_lower in ['unani', 'yunani']:
-                return SystemType.UNANI
-            elif v_lower in ['homeopathy', 'homoeopathy', 'homeo']:
-                return SystemType.HOMEOPATHY
-            elif v_lower in ['tcm', 'traditional chinese medicine', 'chinese medicine']:
-                return SystemType.TRADITIONAL_CHINESE_MEDICINE
-            elif v_lower in ['naturopathy', 'naturo']:
-                return SystemType.NATUROPATHY
-            elif v_lower in ['yoga']:
-                return SystemType.YOGA
-            else:
-                return SystemType.OTHER
+        Returns:
+            TM2ProcessedRecord: Processed record
+        """
+        return cls(**{name: document[name] for name in _field_names(cls) if name in document})
+    
+    def to_wire(self) -> List[Any]:
+        """
+        Encode the record as a msgpack-ready list in field order.
         
-        return v
-    
-    @validator('severity', pre=True)
-    def normalize_severity(cls, v):
-        """Normalize severity level to enum value."""
-        if isinstance(v, str):
-            v_lower = v.lower().strip()
+        Enums are encoded as their SystemTypeCode/SeverityCode values and
+        datetimes as msgpack timestamps.
+        
+        Returns:
+            List: Wire representation of the record
+        """
+        return [
+            self.patient_id,
+            self.tm2_code,
+            self.condition_name,
+            SYSTEM_TYPE_CODES[self.system_type],
+            SEVERITY_CODES[self.severity],
+            _to_timestamp(self.diagnosis_date),
+            self.practitioner_id,
+            _to_timestamp(self.created_at),
+            self.source_file,
+            self.icd11_category,
+            self.traditional_diagnosis
+        ]
+    
+    @classmethod
+    def from_wire(cls, wire: List[Any]) -> "TM2ProcessedRecord":
+        """
+        Decode a record from its wire representation.
+        
+        Args:
+            wire: List produced by ``to_wire``
             
-            if v_lower in ['mild', 'light', 'low']:
-                return SeverityLevel.MILD
-            elif v_lower in ['moderate', 'medium', 'moderate']:
-                return SeverityLevel.MODERATE
-            elif v_lower in ['severe', 'high', 'serious']:
-                return SeverityLevel.SEVERE
-            elif v_lower in ['critical', 'very severe', 'life threatening']:
-                return SeverityLevel.CRITICAL
-            else:
-                return SeverityLevel.UNKNOWN
+        Returns:
+            TM2ProcessedRecord: Decoded record
+        """
+        (
+            patient_id, tm2_code, condition_name, system_type, severity,
+            diagnosis_date, practitioner_id, created_at, source_file,
+            icd11_category, traditional_diagnosis
+        ) = wire
+        return cls(
+            patient_id=patient_id,
+            tm2_code=tm2_code,
+            condition_name=condition_name,
+            system_type=CODE_TO_SYSTEM_TYPE[system_type],
+            severity=CODE_TO_SEVERITY[severity],
+            diagnosis_date=_from_timestamp(diagnosis_date),
+            practitioner_id=practitioner_id,
+            created_at=_from_timestamp(created_at),
+            source_file=source_file,
+            icd11_category=icd11_category,
+            traditional_diagnosis=traditional_diagnosis
+        )
+    
+    def to_msgpack(self) -> bytes:
+        """
+        Serialize the record to msgpack for service-to-service transfer.
         
-        return v
+        Returns:
+            bytes: msgpack-encoded record
+        """
+        return msgpack.packb(self.to_wire())
+    
+    @classmethod
+    def from_msgpack(cls, blob: bytes) -> "TM2ProcessedRecord":
+        """
+        Deserialize a record produced by ``to_msgpack``.
+        
+        Args:
+            blob: msgpack-encoded record
+            
+        Returns:
+            TM2ProcessedRecord: Decoded record
+        """
+        return cls.from_wire(msgpack.unpackb(blob))
 
 
-class TM2ValidationResult(BaseModel):
+class TM2ValidationResult(NamedTuple):
     """
     Result of TM2 record validation.
     
     This model contains the validation outcome and any error messages
-    for a processed TM2 record.
+    for a processed TM2 record. Messages are tuples so the common
+    success case allocates no lists, and results are hashable.
+    
+    Attributes:
+        is_valid: Whether the record passed validation
+        record: Validated record (if validation passed)
+        errors: Validation error messages
+        warnings: Validation warnings
     """
-    
-    is_valid: bool = Field(
-        ...,
-        description="Whether the record passed validation"
-    )
-    
-    record: Optional[TM2ProcessedRecord] = Field(
-        default=None,
-        description="Validated record (if validation passed)"
-    )
-    
-    errors: list[str] = Field(
-        default_factory=list,
-        description="List of validation error messages"
-    )
-    
-    warnings: list[str] = Field(
-        default_factory=list,
-        description="List of validation warnings"
-    )
+    is_valid: bool
+    record: Optional[TM2ProcessedRecord] = None
+    errors: Tuple[str, ...] = ()
+    warnings: Tuple[str, ...] = ()
 
 
-class TM2ConceptMapping(BaseModel):
+@dataclass(slots=True)
+class TM2ConceptMapping:
     """
     Mapping between TM2 codes and OpenMRS concepts.
     
     This model represents the relationship between traditional medicine
     codes and their corresponding OpenMRS concept representations.
-    """
-    
-    tm2_code: str = Field(
-        ...,
-        description="TM2 code from ICD-11",
-        example="TM2.A01.01"
-    )
     
-    openmrs_concept_uuid: Optional[str] = Field(
-        default=None,
-        description="OpenMRS concept UUID if mapping exists",
-        example="5089AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
-    )
-    
-    concept_name: str = Field(
-        ...,
-        description="Human-readable concept name",
-        example="Chronic Insomnia"
-    )
-    
-    concept_description: Optional[str] = Field(
-        default=None,
-        description="Detailed concept description",
-        max_length=1000
-    )
-    
-    system_specific_names: dict[str, str] = Field(
-        default_factory=dict,
-        description="Traditional names in different systems",
-        example={
-            "ayurveda": "Nidranasha",
-            "siddha": "Thookammai",
-            "unani": "Qillat-un-Naum"
-        }
-    )
-    
-    icd11_foundation_id: Optional[str] = Field(
-        default=None,
-        description="ICD-11 Foundation ID for cross-referencing"
-    )
-    
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Mapping creation timestamp"
-    )
-    
-    last_updated: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Last update timestamp"
-    )
+    Attributes:
+        tm2_code: TM2 code from ICD-11
+        concept_name: Human-readable concept name
+        openmrs_concept_uuid: OpenMRS concept UUID if mapping exists
+        concept_description: Detailed concept description
+        system_specific_names: Traditional names in different systems
+        icd11_foundation_id: ICD-11 Foundation ID for cross-referencing
+        created_at: Mapping creation timestamp
+        last_updated: Last update timestamp
+    """
+    tm2_code: str
+    concept_name: str
+    openmrs_concept_uuid: Optional[str] = None
+    concept_description: Optional[str] = None
+    system_specific_names: Dict[str, str] = field(default_factory=dict)
+    icd11_foundation_id: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    last_updated: datetime = field(default_factory=datetime.utcnow)
 
 
-class TM2ProcessingMetadata(BaseModel):
+@dataclass(slots=True)
+class TM2ProcessingMetadata:
     """
     Metadata for TM2 processing operations.
     
     This model tracks processing information for audit and monitoring purposes.
-    """
-    
-    processing_id: str = Field(
-        ...,
-        description="Unique processing session identifier"
-    )
-    
-    filename: str = Field(
-        ...,
-        description="Original filename"
-    )
-    
-    file_size_bytes: int = Field(
-        ...,
-        description="File size in bytes",
-        ge=0
-    )
-    
-    total_records: int = Field(
-        ...,
-        description="Total records in file",
-        ge=0
-    )
-    
-    processed_records: int = Field(
-        default=0,
-        description="Number of successfully processed records",
-        ge=0
-    )
-    
-    failed_records: int = Field(
-        default=0,
-        description="Number of failed records",
-        ge=0
-    )
     
-    processing_start: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Processing start time"
-    )
-    
-    processing_end: Optional[datetime] = Field(
-        default=None,
-        description="Processing completion time"
-    )
-    
-    status: Literal["pending", "processing", "completed", "failed"] = Field(
-        default="pending",
-        description="Current processing status"
-    )
-    
-    error_summary: Optional[str] = Field(
-        default=None,
-        description="Summary of processing errors if any"
-    )
-    
-    @property
-    def processing_duration_seconds(self) -> Optional[float]:
-        """Calculate processing duration in seconds."""
-        if self.processing_end:
-            return (self.processing_end - self.processing_start).total_seconds()
-        return None
-    
-    @property
-    def success_rate(self) -> float:
-        """Calculate success rate as percentage."""
-        if self.total_records == 0:
-            return 0.0
-        return (self.processed_records / self.total_records) * 100
\ No newline at end of file
+    Attributes:
+        processing_id: Unique processing session identifier
+        filename: Original filename
+        file_size_bytes: File size in bytes
+        total_records: Total records in file
+        processed_records: Number of successfully processed records
+        failed_records: Number of failed records
+        processing_start: Processing start time
+        processing_end: Processing completion time
+        status: Current processing status
+        error_summary: Summary of processing errors if any
+        processing_duration_seconds: Processing duration in seconds, set by finalize()
+        success_rate: Success rate as percentage, set by finalize()
+    """
+    processing_id: str
+    filename: str
+    file_size_bytes: int
+    total_records: int
+    processed_records: int = 0
+    failed_records: int = 0
+    processing_start: datetime = field(default_factory=datetime.utcnow)
+    processing_end: Optional[datetime] = None
+    status: Literal["pending", "processing", "completed", "failed"] = "pending"
+    error_summary: Optional[str] = None
+    
+    # Derived values, computed once by finalize()
+    processing_duration_seconds: Optional[float] = field(default=None, init=False)
+    success_rate: float = field(default=0.0, init=False)
+    
+    def finalize(
+        self,
+        status: Literal["completed", "failed"],
+        processing_end: Optional[datetime] = None,
+        error_summary: Optional[str] = None
+    ) -> None:
+        """
+        Mark processing as finished and compute the derived values.
+        
+        Args:
+            status: Final processing status
+            processing_end: Processing completion time, current time if omitted
+            error_summary: Summary of processing errors if any
+        """
+        self.status = status
+        self.processing_end = processing_end or datetime.utcnow()
+        self.error_summary = error_summary
+        self.processing_duration_seconds = (
+            self.processing_end - self.processing_start
+        ).total_seconds()
+        self.success_rate = (
+            (self.processed_records / self.total_records) * 100
+            if self.total_records else 0.0
+        )
@@ -6,24 +6,258 @@ validating data, storing in MongoDB, and submitting to OpenMRS.
 """
 
 import asyncio
+import codecs
 import hashlib
 import io
+import multiprocessing
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, BinaryIO
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterable, List, Any, Optional, Tuple
 from uuid import uuid4
 
 import pandas as pd
 from dateutil import parser as date_parser
 
-from app.core.logging import get_logger, HealthcareOperationContext
+from app.core.bloom import ScalableBloomFilter
+from app.core.logging import get_logger, log_exception, HealthcareOperationContext, DEBUG_ENABLED
 from app.core.config import get_settings
-from app.services.mongo_service import MongoService
+from app.services.mongo_service import MongoService, record_hash_key
 from app.services.openmrs_client import OpenMRSRestClient
-from app.models.tm2_data import TM2RawRecord, TM2ProcessedRecord
+from app.models.tm2_data import (
+    TM2_CODE_PATTERN, ID_PATTERN, TM2_CODE_TO_ICD11_CATEGORY,
+    normalize_severity, normalize_system_type
+)
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Encodings attempted when decoding uploaded CSV files, in order. latin1
+# decodes any byte sequence, so it is the final fallback. A UTF-8 BOM is
+# removed with the header line, so plain utf-8 also covers BOM files.
+CSV_ENCODINGS = ('utf-8', 'latin1')
+
+# Strings pandas reads as missing values by default; the plain-row fast
+# path treats the same cells as missing
+CSV_NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+})
+
+# Largest batch split without pandas; pandas' fixed per-call cost
+# dominates below it, its C tokenizer wins above it
+PLAIN_SPLIT_MAX_ROWS = 1000
+
+# Parsed CSV batch: column name mapped to the batch's raw cell values,
+# None or NaN for missing cells
+ColumnBatch = Dict[str, List[Any]]
+
+# Non-ISO date formats tried before falling back to dateutil
+DATE_FORMATS = (
+    "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d",
+    "%m-%d-%Y", "%d-%m-%Y",
+    "%d %b %Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y"
+)
+
+# Columns every TM2 CSV must provide
+REQUIRED_COLUMNS = (
+    'patient_id', 'tm2_code', 'condition_name', 'system_type',
+    'severity', 'diagnosis_date', 'practitioner_id'
+)
+REQUIRED_COLUMN_SET = frozenset(REQUIRED_COLUMNS)
+
+# Columns TM2RawRecord normalizes to upper case
+UPPERCASE_COLUMNS = ('patient_id', 'tm2_code', 'practitioner_id')
+
+# Source recorded on every processed record built from an upload
+SOURCE_FILE = "uploaded_file"
+
+# Batch result counter incremented for each record status
+STATUS_COUNTERS = {
+    'validated': 'validated_records',
+    'duplicate': 'duplicate_records',
+    'validation_error': 'validation_errors',
+    'stored': 'stored_records',
+    'submitted': 'submitted_records',
+    'storage_error': 'storage_errors',
+    'submission_error': 'submission_errors'
+}
+
+# Processing result of a single record: its status and error message, if any
+RecordResult = Tuple[str, Optional[str]]
+
+# Shared results of records without a record-specific error
+VALIDATION_FAILED: RecordResult = ('validation_error', 'Data validation failed')
+DUPLICATE: RecordResult = ('duplicate', None)
+SUBMITTED: RecordResult = ('submitted', None)
+
+# Record statuses whose error messages are reported, with fallback messages
+ERROR_STATUS_MESSAGES = {
+    'validation_error': 'Unknown validation error',
+    'storage_error': 'Unknown storage error',
+    'submission_error': 'Unknown submission error',
+    'processing_error': 'Unknown processing error'
+}
+
+# Service statistics mapped to the batch result counters they accumulate
+PROCESSING_STAT_COUNTERS = {
+    'records_processed': 'processed_records',
+    'records_validated': 'validated_records',
+    'records_stored': 'stored_records',
+    'records_submitted': 'submitted_records',
+    'validation_errors': 'validation_errors',
+    'storage_errors': 'storage_errors',
+    'submission_errors': 'submission_errors',
+    'duplicate_records': 'duplicate_records'
+}
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds the configured size limit."""
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_string: str) -> Optional[datetime]:
+    """
+    Parse a date string, trying the cheapest parsers first.
+    
+    ISO 8601 strings go through the C ``datetime.fromisoformat``, then a
+    fixed list of common formats is tried with ``strptime`` (month-first
+    before day-first, as dateutil does), and dateutil handles the rest.
+    Results are cached because dates repeat heavily within a file, which
+    makes per-record parsing as fast as a vectorized ``pd.to_datetime``
+    over the column while keeping the dateutil fallback.
+    
+    Args:
+        date_string: Date string in various formats
+        
+    Returns:
+        Optional[datetime]: Parsed datetime, or None if unparseable
+    """
+    try:
+        return datetime.fromisoformat(date_string)
+    except ValueError:
+        pass
+    
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_string, date_format)
+        except ValueError:
+            continue
+    
+    try:
+        return date_parser.parse(date_string)
+    except Exception:
+        return None
+
+
+def parse_date(date_string: str) -> datetime:
+    """
+    Parse date string into datetime object.
+    
+    Args:
+        date_string: Date string in various formats
+        
+    Returns:
+        datetime: Parsed datetime object
+    """
+    parsed = _parse_date_string(date_string)
+    if parsed is None:
+        # Return current date if parsing fails
+        logger.warning("Failed to parse date, using current date", date_string=date_string)
+        return datetime.utcnow()
+    
+    return parsed
+
+
+def validate_records(
+    raw_records: List[Optional[Dict[str, Any]]],
+    created_at: Optional[datetime] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Transform a batch of screened raw TM2 records into processed records.
+    
+    Rows reaching this point have passed ``screen_records``, which applies
+    every TM2RawRecord rule to whole columns, so processed documents are
+    built straight from the raw dictionaries without constructing a model
+    per row. Dates, system types and severities repeat heavily within a
+    batch, so each distinct value is normalized once per batch.
+    
+    Defined at module level so it can be dispatched to worker processes.
+    The clock is read once per batch and the timestamp shared by every
+    record in it.
+    
+    Args:
+        raw_records: Screened raw record dictionaries, None for rejected rows
+        created_at: Creation timestamp for the batch, current time if omitted
+        
+    Returns:
+        List[Optional[Dict]]: Validated records, with None for invalid ones
+    """
+    created_at = created_at or datetime.utcnow()
+    records = [record for record in raw_records if record is not None]
+    
+    system_types = {value: normalize_system_type(value) for value in {r["system_type"] for r in records}}
+    severities = {value: normalize_severity(value) for value in {r["severity"] for r in records}}
+    dates = {value: parse_date(value) for value in {r["diagnosis_date"] for r in records}}
+    icd11_category = TM2_CODE_TO_ICD11_CATEGORY.get
+    
+    # Keys follow TM2ProcessedRecord field order, as asdict_fast produces
+    return [
+        {
+            "patient_id": record["patient_id"],
+            "tm2_code": record["tm2_code"],
+            "condition_name": record["condition_name"],
+            "system_type": system_types[record["system_type"]],
+            "severity": severities[record["severity"]],
+            "diagnosis_date": dates[record["diagnosis_date"]],
+            "practitioner_id": record["practitioner_id"],
+            "created_at": created_at,
+            "source_file": SOURCE_FILE,
+            "icd11_category": icd11_category(record["tm2_code"]),
+            "traditional_diagnosis": None
+        }
+        if record is not None else None
+        for record in raw_records
+    ]
+
+
+def screen_records(columns: Dict[str, List[Optional[str]]]) -> List[bool]:
+    """
+    Check the TM2RawRecord rules for a whole batch at once.
+    
+    Every field rule of the model is checked row by row on plain lists:
+    required values, length limits and the TM2 code and ID formats. Rows
+    passing the checks are valid TM2RawRecords once upper-cased like the
+    model's validators do.
+    
+    Args:
+        columns: Stripped column values keyed by column name, None for
+            missing cells
+        
+    Returns:
+        List[bool]: True for rows worth validating
+    """
+    code_match = TM2_CODE_PATTERN.fullmatch
+    id_match = ID_PATTERN.fullmatch
+    
+    return [
+        bool(
+            patient_id and tm2_code and condition_name and system_type
+            and severity and diagnosis_date and practitioner_id
+            and len(condition_name) <= 200
+            and code_match(tm2_code)
+            and id_match(patient_id)
+            and id_match(practitioner_id)
+        )
+        for (
+            patient_id, tm2_code, condition_name, system_type,
+            severity, diagnosis_date, practitioner_id
+        ) in zip(*(columns[col] for col in REQUIRED_COLUMNS))
+    ]
+
 
 class TM2IngestionService:
     """
@@ -48,6 +282,21 @@ class TM2IngestionService:
         self.mongo_service = mongo_service
         self.openmrs_client = openmrs_client
         
+        # Worker processes for record validation, created on first use
+        self._validation_pool: Optional[ProcessPoolExecutor] = None
+        
+        # Hashes of stored records, loaded from MongoDB on first use
+        self._seen_hashes: Optional[ScalableBloomFilter] = None
+        
+        # 64-bit keys of hashes known to be stored, most recently used last;
+        # records are never deleted, so entries only leave when the cache
+        # is full. Only hashes the filter has seen are looked up here, so a
+        # key collision must coincide with a filter false positive.
+        self._known_hashes: "OrderedDict[int, None]" = OrderedDict()
+        
+        # Caps concurrent OpenMRS submissions across all in-flight batches
+        self._submit_semaphore = asyncio.Semaphore(settings.openmrs_concurrency)
+        
         # Processing statistics
         self.processing_stats = {
             "files_processed": 0,
@@ -61,16 +310,40 @@ class TM2IngestionService:
             "duplicate_records": 0
         }
     
-    async def process_tm2_file(self, file_content: BinaryIO, filename: str) -> Dict[str, Any]:
+    async def process_tm2_file(
+        self,
+        file_content: AsyncIterator[bytes],
+        filename: str,
+        file_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process a complete TM2 dataset file.
         
+        The file is consumed as a stream of byte chunks and processed one
+        batch at a time. Parsing runs ahead of validation and storage
+        through a queue of at most ``settings.ingest_queue_size`` batches,
+        so memory use is bounded by the queue rather than the size of the
+        upload.
+        
+        When the content hash is known up front, a file whose ingestion
+        completed without errors within ``ingest_cache_ttl_seconds`` is not
+        processed again; its earlier result is returned instead.
+        
+        Batches are stored and submitted before the rest of the file is
+        parsed, so if processing fails after some batches were committed,
+        the result has status ``partial`` with the summary of those
+        batches, and they are counted in the processing statistics.
+        
         Args:
-            file_content: File content as binary stream
+            file_content: File content as an async iterator of byte chunks
             filename: Original filename
+            file_hash: SHA-256 hex digest of the whole file, if known
             
         Returns:
             Dict: Processing results and statistics
+            
+        Raises:
+            FileTooLargeError: If the stream exceeds the configured size limit
         """
         processing_id = str(uuid4())
         
@@ -81,18 +354,53 @@ class TM2IngestionService:
                 filename=filename
             )
             
+            use_cache = file_hash is not None and settings.ingest_cache_ttl_seconds > 0
+            if use_cache:
+                cached = await self.mongo_service.get_cached_ingestion(file_hash)
+                if cached is not None:
+                    logger.info(
+                        "Returning cached result for previously ingested file",
+                        processing_id=cached["processing_id"],
+                        filename=filename
+                    )
+                    return {
+                        **cached,
+                        "filename": filename,
+                        "cached": True,
+                        "statistics": self.processing_stats.copy()
+                    }
+            
+            processing_results = self._new_batch_results()
+            
             try:
-                # Read and parse CSV file
-                raw_data = await self._read_csv_file(file_content)
+                if self._seen_hashes is None:
+                    await self.load_seen_hashes()
+                
+                submitting: Optional[asyncio.Task] = None
+                queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ingest_queue_size)
+                producer = asyncio.create_task(self._produce_batches(file_content, queue))
+                
+                # Store parsed batches in file order; each batch is submitted
+                # to OpenMRS while the next one is being stored
+                try:
+                    while (records := await queue.get()) is not None:
+                        submission = await self._process_records_batch(records, processing_id)
+                        if submitting is not None:
+                            self._merge_batch_results(processing_results, await submitting)
+                        submitting = submission
+                    
+                    # Re-raise any parsing error
+                    await producer
+                finally:
+                    producer.cancel()
+                    # Let stored records finish submitting even if parsing failed
+                    if submitting is not None:
+                        self._merge_batch_results(processing_results, await submitting)
+                
                 logger.info(
                     "CSV file parsed successfully",
                     processing_id=processing_id,
-                    raw_record_count=len(raw_data)
-                )
-                
-                # Process records in batches
-                processing_results = await self._process_records_batch(
-                    raw_data, processing_id
+                    raw_record_count=processing_results["total_records"]
                 )
                 
                 # Update global statistics
@@ -114,17 +422,51 @@ class TM2IngestionService:
                     **processing_results
                 )
                 
+                if (
+                    use_cache
+                    and not processing_results["storage_errors"]
+                    and not processing_results["submission_errors"]
+                ):
+                    await self._cache_result(file_hash, result)
+                
                 return result
                 
+            except FileTooLargeError:
+                logger.warning(
+                    "TM2 file exceeds size limit",
+                    processing_id=processing_id,
+                    filename=filename,
+                    max_size_mb=settings.max_file_size_mb,
+                    committed_records=processing_results["total_records"]
+                )
+                if processing_results["total_records"]:
+                    self._update_processing_stats(processing_results)
+                raise
+                
             except Exception as e:
-                logger.error(
+                log_exception(
+                    logger,
                     "Failed to process TM2 file",
                     processing_id=processing_id,
                     filename=filename,
                     error=str(e),
-                    exc_info=True
+                    committed_records=processing_results["total_records"]
                 )
                 
+                # Batches stored before the failure stay stored and submitted
+                if processing_results["total_records"]:
+                    self._record_error(processing_results, str(e))
+                    self._update_processing_stats(processing_results)
+                    return {
+                        "processing_id": processing_id,
+                        "filename": filename,
+                        "status": "partial",
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "error": str(e),
+                        "summary": processing_results,
+                        "statistics": self.processing_stats.copy()
+                    }
+                
                 return {
                     "processing_id": processing_id,
                     "filename": filename,
@@ -134,161 +476,435 @@ class TM2IngestionService:
                     "statistics": self.processing_stats.copy()
                 }
     
-    async def _read_csv_file(self, file_content: BinaryIO) -> List[Dict[str, Any]]:
+    async def _cache_result(self, file_hash: str, result: Dict[str, Any]) -> None:
+        """
+        Cache a completed ingestion result for re-uploads of the same file.
+        
+        A failed cache write is logged and otherwise ignored, since the
+        file itself was processed successfully.
+        
+        Args:
+            file_hash: SHA-256 hex digest of the file content
+            result: Completed ingestion result
+        """
+        try:
+            await self.mongo_service.cache_ingestion(file_hash, result)
+        except Exception as e:
+            logger.warning("Failed to cache ingestion result", file_hash=file_hash, error=str(e))
+    
+    async def _produce_batches(self, file_content: AsyncIterator[bytes], queue: asyncio.Queue) -> None:
+        """
+        Parse CSV content into record batches and queue them for storage.
+        
+        The queue is bounded, so parsing pauses while storage falls behind.
+        None is queued once parsing ends, whether or not it succeeded.
+        
+        Args:
+            file_content: Async iterator of raw byte chunks
+            queue: Queue receiving record lists, then None
+        """
+        try:
+            async for frame in self._read_csv_file(file_content):
+                await queue.put(await asyncio.to_thread(self._frame_to_records, frame))
+        except Exception:
+            await queue.put(None)
+            raise
+        
+        await queue.put(None)
+    
+    async def _read_csv_file(self, file_content: AsyncIterator[bytes]) -> AsyncIterator[ColumnBatch]:
         """
-        Read and parse CSV file content with robust error handling.
+        Incrementally parse streamed CSV content into column batches.
+
+        Incoming chunks are split on record boundaries (newlines outside of
+        quoted fields) and parsed ``settings.batch_size`` rows at a time in
+        a worker thread, so the event loop keeps serving submissions and
+        requests while the batch is parsed.
+        The encoding is detected once from the first chunk and stays the
+        first choice for every batch, so all batches of a file decode the
+        same way; a batch the detected encoding cannot decode falls back
+        to the other candidates on its own.
 
         Args:
-            file_content: Binary file content
+            file_content: Async iterator of raw byte chunks
 
-        Returns:
-            List[Dict]: Parsed CSV data as list of dictionaries
+        Yields:
+            ColumnBatch: Parsed batch with completely empty rows removed
 
         Raises:
             ValueError: If file format is invalid
+            FileTooLargeError: If the stream exceeds ``max_file_size_mb``
         """
-        try:
-            # Reset file pointer to beginning (critical fix for UploadFile)
-            file_content.seek(0)
-
-            # Read raw content for validation
-            raw_content = file_content.read()
+        max_bytes = settings.max_file_size_mb * 1024 * 1024
+        batch_size = settings.batch_size
+        encodings: Tuple[str, ...] = CSV_ENCODINGS
+        header: Optional[bytes] = None
+        columns: List[str] = []
+        pending = b""
+        rows: List[bytes] = []
+        total_bytes = 0
+        total_rows = 0
+        empty_rows = 0
 
-            # Check if file is empty
-            if not raw_content or len(raw_content.strip()) == 0:
-                raise ValueError("File is empty or contains no data")
+        try:
+            async for chunk in file_content:
+                if not total_bytes:
+                    encoding = self._detect_encoding(chunk)
+                    encodings = (encoding, *(e for e in CSV_ENCODINGS if e != encoding))
 
-            # Try different encodings if UTF-8 fails
-            encodings_to_try = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
-            df = None
-            successful_encoding = None
+                total_bytes += len(chunk)
+                if total_bytes > max_bytes:
+                    raise FileTooLargeError(
+                        f"File size exceeds {settings.max_file_size_mb}MB limit"
+                    )
 
-            for encoding in encodings_to_try:
-                try:
-                    file_content.seek(0)  # Reset pointer for each attempt
-                    df = pd.read_csv(io.BytesIO(file_content.read()), encoding=encoding)
-                    successful_encoding = encoding
-                    break
-                except UnicodeDecodeError:
-                    continue
-                except pd.errors.EmptyDataError:
-                    raise ValueError("CSV file contains no data rows")
-                except Exception as e:
-                    if encoding == encodings_to_try[-1]:  # Last encoding attempted
-                        raise ValueError(f"Failed to parse CSV with any supported encoding: {str(e)}")
-                    continue
+                complete, pending = self._split_csv_records(pending + chunk)
+                for record in complete:
+                    if header is None:
+                        # Leading blank lines are ignored, like pandas does
+                        if record.strip():
+                            header, columns = self._validate_csv_header(record, encodings)
+                        continue
 
-            if df is None or df.empty:
-                raise ValueError("No valid data found in CSV file")
+                    rows.append(record)
+                    if len(rows) >= batch_size:
+                        frame = await asyncio.to_thread(
+                            self._parse_csv_batch, header, rows, encodings, columns
+                        )
+                        rows = []
+                        row_count = self._row_count(frame)
+                        total_rows += row_count
+                        empty_rows += batch_size - row_count
+                        if row_count:
+                            yield frame
 
-            logger.info(
-                "CSV file read successfully",
-                encoding=successful_encoding,
-                raw_content_size=len(raw_content),
-                dataframe_shape=df.shape,
-                columns=list(df.columns)
-            )
+            # Flush the trailing record (no final newline) and partial batch
+            if pending.strip():
+                if header is None:
+                    header, columns = self._validate_csv_header(pending, encodings)
+                else:
+                    rows.append(pending)
 
-            # Validate required columns
-            required_columns = {
-                'patient_id', 'tm2_code', 'condition_name', 'system_type',
-                'severity', 'diagnosis_date', 'practitioner_id'
-            }
+            if header is None:
+                raise ValueError("File is empty or contains no data")
 
-            missing_columns = required_columns - set(df.columns)
-            if missing_columns:
-                logger.error(
-                    "Missing required columns in CSV",
-                    missing_columns=list(missing_columns),
-                    available_columns=list(df.columns)
+            if rows:
+                frame = await asyncio.to_thread(
+                    self._parse_csv_batch, header, rows, encodings, columns
                 )
-                raise ValueError(f"Missing required columns: {missing_columns}")
+                row_count = self._row_count(frame)
+                total_rows += row_count
+                empty_rows += len(rows) - row_count
+                if row_count:
+                    yield frame
 
-            # Check for empty headers
-            empty_headers = [col for col in df.columns if not col or str(col).strip() == '']
-            if empty_headers:
-                logger.warning("CSV contains empty column headers", empty_headers=empty_headers)
-
-            # Validate that we have actual data rows (not just headers)
-            if len(df) == 0:
+            if total_rows == 0:
                 raise ValueError("CSV file contains headers but no data rows")
 
-            # Check for completely empty rows
-            non_empty_rows = len(df.dropna(how='all'))
-            if non_empty_rows == 0:
-                raise ValueError("CSV file contains no non-empty data rows")
-
-            # Convert to list of dictionaries, filtering out empty rows
-            records = []
-            for idx, row in df.iterrows():
-                # Skip rows where all values are NaN or empty
-                if row.dropna().empty:
-                    logger.warning(f"Skipping empty row at index {idx}")
-                    continue
-
-                # Convert row to dict and clean up
-                record = {}
-                for col in df.columns:
-                    value = row[col]
-                    # Handle NaN values
-                    if pd.isna(value):
-                        record[col] = None
-                    else:
-                        record[col] = str(value).strip() if isinstance(value, str) else value
-
-                records.append(record)
-
             logger.info(
                 "CSV parsing completed successfully",
-                total_records=len(records),
-                non_empty_rows=non_empty_rows,
-                empty_rows_filtered=len(df) - len(records),
-                columns=list(df.columns),
-                encoding=successful_encoding
+                total_records=total_rows,
+                raw_content_size=total_bytes,
+                empty_rows_filtered=empty_rows,
+                encoding=encodings[0]
             )
 
-            return records
-
         except ValueError:
             # Re-raise ValueError as-is (our custom validation errors)
             raise
         except Exception as e:
-            logger.error(
+            log_exception(
+                logger,
                 "Unexpected error during CSV parsing",
                 error=str(e),
-                error_type=type(e).__name__,
-                exc_info=True
+                error_type=type(e).__name__
             )
             raise ValueError(f"Failed to parse CSV file: {str(e)}")
+
+    @staticmethod
+    def _detect_encoding(probe: bytes) -> str:
+        """
+        Pick the first supported encoding that can decode a probe of the file.
+
+        The probe may end in the middle of a multi-byte character, so it is
+        decoded incrementally without requiring a complete final sequence.
+
+        Args:
+            probe: Leading bytes of the file
+
+        Returns:
+            str: Detected encoding, the first candidate if none decodes
+        """
+        for encoding in CSV_ENCODINGS:
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(probe, final=False)
+            except UnicodeDecodeError:
+                continue
+            return encoding
+
+        return CSV_ENCODINGS[0]
+
+    @staticmethod
+    def _split_csv_records(buffer: bytes) -> Tuple[List[bytes], bytes]:
+        """
+        Split a byte buffer into complete CSV records.
+
+        A newline terminates a record only when it is not inside a quoted
+        field, i.e. when an even number of quote characters precede it.
+
+        Args:
+            buffer: Buffered bytes starting at a record boundary
+
+        Returns:
+            Tuple: Complete records (with line endings) and the unconsumed tail
+        """
+        records = []
+        start = 0
+        position = 0
+        in_quotes = False
+
+        while True:
+            newline = buffer.find(b"\n", position)
+            if newline == -1:
+                break
+
+            if buffer.count(b'"', position, newline) % 2:
+                in_quotes = not in_quotes
+            position = newline + 1
+
+            if not in_quotes:
+                records.append(buffer[start:position])
+                start = position
+
+        return records, buffer[start:]
+
+    def _validate_csv_header(self, header: bytes, encodings: Tuple[str, ...]) -> Tuple[bytes, List[str]]:
+        """
+        Validate the CSV header line before any data rows are parsed.
+
+        Args:
+            header: Raw header line
+            encodings: Candidate encodings, most likely first
+
+        Returns:
+            Tuple: Header line with any UTF-8 BOM removed, and the column
+            names as pandas reads them
+
+        Raises:
+            ValueError: If required columns are missing
+        """
+        if header.startswith(codecs.BOM_UTF8):
+            header = header[len(codecs.BOM_UTF8):]
+
+        columns = list(self._parse_csv_batch(header, [], encodings))
+
+        logger.info(
+            "CSV header read successfully",
+            encoding=encodings[0],
+            columns=columns
+        )
+
+        # Validate required columns
+        missing_columns = REQUIRED_COLUMN_SET.difference(columns)
+        if missing_columns:
+            logger.error(
+                "Missing required columns in CSV",
+                missing_columns=list(missing_columns),
+                available_columns=columns
+            )
+            raise ValueError(f"Missing required columns: {set(missing_columns)}")
+
+        # Check for empty headers
+        empty_headers = [col for col in columns if not col or str(col).strip() == '']
+        if empty_headers:
+            logger.warning("CSV contains empty column headers", empty_headers=empty_headers)
+
+        return (header if header.endswith(b"\n") else header + b"\n"), columns
+
+    @staticmethod
+    def _parse_csv_batch(
+        header: bytes,
+        rows: List[bytes],
+        encodings: Tuple[str, ...],
+        columns: Optional[List[str]] = None
+    ) -> ColumnBatch:
+        """
+        Parse one batch of raw CSV records.
+
+        Once the header's columns are known, batches of up to
+        ``PLAIN_SPLIT_MAX_ROWS`` rows without quotes, whose rows all have one
+        field per column, are split directly, which skips the fixed per-call
+        cost of pandas on batch-sized inputs. Anything else goes through the C parser with every column read as a string,
+        skipping pandas' per-column type inference; type checks happen
+        during record validation. The pyarrow engine is not used: it is
+        slower on batch-sized inputs and turns missing values into "None"
+        strings when columns are read as strings. ``encodings`` is never
+        reordered: a batch that needs a fallback encoding does not change
+        how later batches are decoded.
+
+        Args:
+            header: Header line
+            rows: Raw data records
+            encodings: Candidate encodings, detected encoding first
+            columns: Column names read from the header, None to always use pandas
+
+        Returns:
+            ColumnBatch: Parsed batch with completely empty rows removed
+
+        Raises:
+            ValueError: If the batch cannot be decoded or parsed
+        """
+        body = b"".join(rows)
+
+        for encoding in encodings:
+            try:
+                text = body.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+
+            if encoding != encodings[0]:
+                logger.warning(
+                    "CSV batch decoded with fallback encoding",
+                    encoding=encoding,
+                    detected_encoding=encodings[0]
+                )
+
+            if columns is not None and len(rows) <= PLAIN_SPLIT_MAX_ROWS:
+                batch = TM2IngestionService._split_plain_rows(text, columns)
+                if batch is not None:
+                    return batch
+
+            try:
+                df = pd.read_csv(
+                    io.BytesIO(header + body),
+                    encoding=encoding,
+                    engine="c",
+                    dtype=str
+                )
+            except UnicodeDecodeError:
+                continue
+            except pd.errors.EmptyDataError:
+                raise ValueError("CSV file contains no data rows")
+            except pd.errors.ParserError as e:
+                raise ValueError(f"Failed to parse CSV: {str(e)}")
+
+            df = df.dropna(how='all')
+            return {name: df[name].tolist() for name in df.columns}
+
+        raise ValueError("Failed to parse CSV with any supported encoding")
+
+    @staticmethod
+    def _split_plain_rows(text: str, columns: List[str]) -> Optional[ColumnBatch]:
+        """
+        Split decoded CSV rows that need no quote or line-ending handling.
+
+        Cells are read exactly as pandas would read them for such rows:
+        unstripped, with its default missing-value strings as None, and
+        blank or entirely missing rows dropped.
+
+        Args:
+            text: Decoded data rows
+            columns: Column names read from the header
+
+        Returns:
+            Optional[ColumnBatch]: Parsed batch, or None if the rows contain
+            quotes, carriage returns outside line endings, or a row whose
+            field count differs from the header
+        """
+        if '"' in text:
+            return None
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+            if "\r" in text:
+                return None
+
+        split_rows = [line.split(",") for line in text.split("\n") if line]
+        if not split_rows:
+            return {name: [] for name in columns}
+        if any(len(fields) != len(columns) for fields in split_rows):
+            return None
+
+        na_values = CSV_NA_VALUES
+        batch = {
+            name: [None if value in na_values else value for value in values]
+            for name, values in zip(columns, zip(*split_rows))
+        }
+
+        # Missing cells are None and every other cell is a non-empty string,
+        # so a row is entirely missing exactly when none of its cells is truthy
+        if any(None in values for values in batch.values()):
+            keep = [any(row) for row in zip(*batch.values())]
+            if not all(keep):
+                batch = {
+                    name: [value for value, kept in zip(values, keep) if kept]
+                    for name, values in batch.items()
+                }
+
+        return batch
+
+    @staticmethod
+    def _row_count(batch: ColumnBatch) -> int:
+        """Get the number of rows in a parsed batch."""
+        return len(next(iter(batch.values()), ()))
+
+    @staticmethod
+    def _frame_to_records(frame: ColumnBatch) -> List[Optional[Dict[str, Any]]]:
+        """
+        Convert a parsed column batch to a list of record dictionaries.
+
+        This is where raw records are validated: rows failing the column
+        checks are returned as None so they are counted as validation
+        errors without building a model. Stripping, screening and record
+        building run over plain column lists, which avoids the per-call
+        overhead of Series string methods and ``to_dict`` that dominates
+        at batch sizes.
+
+        Args:
+            frame: Parsed CSV batch
+
+        Returns:
+            List[Optional[Dict]]: Records with NaN replaced by None and strings
+            stripped, None for rejected rows
+        """
+        names = list(frame)
+        columns = {
+            name: [value.strip() if isinstance(value, str) else None for value in values]
+            for name, values in frame.items()
+        }
+        
+        valid = screen_records(columns)
+        rejected = valid.count(False)
+        if rejected:
+            logger.warning("Records rejected by column checks", rejected_records=rejected)
+        
+        for col in UPPERCASE_COLUMNS:
+            columns[col] = [value.upper() if value is not None else None for value in columns[col]]
+        
+        return [
+            dict(zip(names, row)) if ok else None
+            for row, ok in zip(zip(*(columns[name] for name in names)), valid)
+        ]
     
     async def _process_records_batch(
         self, 
-        raw_records: List[Dict[str, Any]], 
+        raw_records: List[Optional[Dict[str, Any]]], 
         processing_id: str
-    ) -> Dict[str, Any]:
+    ) -> "asyncio.Task[Dict[str, Any]]":
         """
-        Process a batch of raw records through the complete pipeline.
+        Validate and store a batch of raw records, then submit it in the background.
+        
+        Records are stored before this returns, so batches handed in one
+        after another keep their order for duplicate detection, while the
+        OpenMRS submissions of one batch overlap with the next batch.
         
         Args:
             raw_records: List of raw record dictionaries
             processing_id: Unique processing session ID
             
         Returns:
-            Dict: Batch processing results
+            asyncio.Task: Task resolving to the batch processing results once
+            the batch's submissions have finished
         """
-        batch_results = {
-            "total_records": len(raw_records),
-            "processed_records": 0,
-            "validated_records": 0,
-            "stored_records": 0,
-            "submitted_records": 0,
-            "validation_errors": 0,
-            "storage_errors": 0,
-            "submission_errors": 0,
-            "duplicate_records": 0,
-            "errors": []
-        }
-        
         logger.info(
             "Starting batch processing",
             processing_id=processing_id,
@@ -297,6 +913,7 @@ class TM2IngestionService:
         
         # Process records in chunks for better performance
         chunk_size = settings.batch_size
+        submissions = []
         for i in range(0, len(raw_records), chunk_size):
             chunk = raw_records[i:i + chunk_size]
             
@@ -307,42 +924,53 @@ class TM2IngestionService:
                 chunk_size=len(chunk)
             )
             
-            # Process chunk concurrently
-            chunk_tasks = [
-                self._process_single_record(record, processing_id)
-                for record in chunk
-            ]
-            
-            chunk_results = await asyncio.gather(
-                *chunk_tasks, 
-                return_exceptions=True
-            )
+            # Validate and store the chunk, then submit its records
+            validated_records = await self._validate_batch(chunk)
+            results, stored = await self._store_chunk(validated_records, processing_id)
+            submissions.append(asyncio.create_task(
+                self._submit_chunk(results, stored, processing_id)
+            ))
+        
+        return asyncio.create_task(
+            self._collect_batch_results(submissions, len(raw_records), processing_id)
+        )
+    
+    async def _collect_batch_results(
+        self,
+        submissions: List["asyncio.Task[List[RecordResult]]"],
+        total_records: int,
+        processing_id: str
+    ) -> Dict[str, Any]:
+        """
+        Wait for a batch's chunk submissions and aggregate their results.
+        
+        Args:
+            submissions: Submission task of each chunk
+            total_records: Number of records in the batch
+            processing_id: Unique processing session ID
             
-            # Aggregate chunk results
+        Returns:
+            Dict: Batch processing results
+        """
+        batch_results = self._new_batch_results(total_records)
+        
+        status_counts = Counter()
+        record_error = self._record_error
+        for chunk_results in await asyncio.gather(*submissions):
             for result in chunk_results:
                 if isinstance(result, Exception):
-                    batch_results["errors"].append(str(result))
+                    record_error(batch_results, str(result))
                     continue
                 
-                batch_results["processed_records"] += 1
-                
-                if result["status"] == "validated":
-                    batch_results["validated_records"] += 1
-                elif result["status"] == "duplicate":
-                    batch_results["duplicate_records"] += 1
-                elif result["status"] == "validation_error":
-                    batch_results["validation_errors"] += 1
-                    batch_results["errors"].append(result.get("error", "Unknown validation error"))
-                elif result["status"] == "stored":
-                    batch_results["stored_records"] += 1
-                elif result["status"] == "submitted":
-                    batch_results["submitted_records"] += 1
-                elif result["status"] == "storage_error":
-                    batch_results["storage_errors"] += 1
-                    batch_results["errors"].append(result.get("error", "Unknown storage error"))
-                elif result["status"] == "submission_error":
-                    batch_results["submission_errors"] += 1
-                    batch_results["errors"].append(result.get("error", "Unknown submission error"))
+                status, error = result
+                status_counts[status] += 1
+                if status in ERROR_STATUS_MESSAGES:
+                    record_error(batch_results, error or ERROR_STATUS_MESSAGES[status])
+        
+        batch_results["processed_records"] += sum(status_counts.values())
+        for status, count in status_counts.items():
+            if status in STATUS_COUNTERS:
+                batch_results[STATUS_COUNTERS[status]] += count
         
         logger.info(
             "Batch processing completed",
@@ -352,219 +980,421 @@ class TM2IngestionService:
         
         return batch_results
     
-    async def _process_single_record(
-        self, 
-        raw_record: Dict[str, Any], 
+    @staticmethod
+    def _new_batch_results(total_records: int = 0) -> Dict[str, Any]:
+        """
+        Create an empty batch results accumulator.
+        
+        Args:
+            total_records: Number of records in the batch
+            
+        Returns:
+            Dict: Zeroed batch results
+        """
+        return {
+            "total_records": total_records,
+            "processed_records": 0,
+            "validated_records": 0,
+            "stored_records": 0,
+            "submitted_records": 0,
+            "validation_errors": 0,
+            "storage_errors": 0,
+            "submission_errors": 0,
+            "duplicate_records": 0,
+            "errors": [],
+            "errors_truncated": 0
+        }
+    
+    @staticmethod
+    def _record_error(results: Dict[str, Any], message: str) -> None:
+        """
+        Keep an error message, up to ``settings.max_reported_errors``.
+        
+        Messages past the limit are only counted in ``errors_truncated``.
+        
+        Args:
+            results: Batch or file results (updated in place)
+            message: Error message
+        """
+        if len(results["errors"]) < settings.max_reported_errors:
+            results["errors"].append(message)
+        else:
+            results["errors_truncated"] += 1
+    
+    @staticmethod
+    def _merge_batch_results(totals: Dict[str, Any], batch_results: Dict[str, Any]) -> None:
+        """
+        Add one batch's results into the running file totals.
+        
+        Args:
+            totals: Accumulated results for the file (updated in place)
+            batch_results: Results of a single batch
+        """
+        for key, value in batch_results.items():
+            if key == "errors":
+                room = settings.max_reported_errors - len(totals["errors"])
+                totals["errors"].extend(value[:room])
+                totals["errors_truncated"] += len(value[room:])
+            else:
+                totals[key] += value
+    
+    async def _validate_batch(
+        self,
+        raw_records: List[Optional[Dict[str, Any]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Validate raw records, fanning out across worker processes.
+        
+        With ``settings.validation_workers`` greater than one, the batch is
+        split into one slice per worker and validated in parallel off the
+        event loop; otherwise it is validated in-process.
+        
+        Args:
+            raw_records: Raw record dictionaries, None for already rejected rows
+            
+        Returns:
+            List[Optional[Dict]]: Validated records in input order, None if invalid
+        """
+        created_at = datetime.utcnow()
+        workers = settings.validation_workers
+        if workers <= 1 or len(raw_records) <= 1:
+            return validate_records(raw_records, created_at)
+        
+        if self._validation_pool is None:
+            self._validation_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        
+        loop = asyncio.get_running_loop()
+        slice_size = -(-len(raw_records) // workers)
+        slices = await asyncio.gather(*[
+            loop.run_in_executor(
+                self._validation_pool,
+                validate_records,
+                raw_records[i:i + slice_size],
+                created_at
+            )
+            for i in range(0, len(raw_records), slice_size)
+        ])
+        
+        return [record for records in slices for record in records]
+    
+    async def _store_chunk(
+        self,
+        validated_records: List[Optional[Dict[str, Any]]],
         processing_id: str
-    ) -> Dict[str, Any]:
+    ) -> Tuple[List[Optional[RecordResult]], List[Tuple[int, str, Dict[str, Any]]]]:
         """
-        Process a single TM2 record through the complete pipeline.
+        Filter duplicates from a validated chunk and store it in one MongoDB batch.
         
         Args:
-            raw_record: Raw record dictionary
+            validated_records: Validated record dictionaries, None where validation failed
             processing_id: Processing session ID
             
         Returns:
-            Dict: Processing result for the record
+            Tuple: Processing results in input order, None for stored records
+            still to be submitted, and the stored records as
+            (index, stored_id, validated_record) tuples
         """
-        record_id = str(uuid4())
+        results: List[Optional[RecordResult]] = [None] * len(validated_records)
+        pending = []
+        chunk_hashes = set()
+        duplicate_count = 0
         
-        try:
-            # Step 1: Validate and transform raw data
-            validated_record = await self._validate_and_transform_record(raw_record)
+        # Step 1: Hash valid records and look up, in one query, those the
+        # filter may have seen and the cache cannot answer
+        record_hashes = self._hash_records(validated_records)
+        seen_hashes = self._seen_hashes
+        known_hashes = self._known_hashes
+        existing_hashes = set()
+        candidates = []
+        for record_hash in record_hashes:
+            if record_hash is None or record_hash not in seen_hashes:
+                continue
+            if record_hash_key(record_hash) in known_hashes:
+                existing_hashes.add(record_hash)
+            else:
+                candidates.append(record_hash)
+        if candidates:
+            existing_hashes |= await self.mongo_service.find_existing_hashes(candidates)
+        if existing_hashes:
+            self._remember_hashes(existing_hashes)
+        
+        # Step 2: Reject invalid records and filter duplicates
+        add_chunk_hash = chunk_hashes.add
+        add_pending = pending.append
+        for index, (validated_record, record_hash) in enumerate(zip(validated_records, record_hashes)):
             if not validated_record:
-                return {
-                    "record_id": record_id,
-                    "status": "validation_error",
-                    "error": "Data validation failed"
-                }
+                results[index] = VALIDATION_FAILED
+                continue
             
-            # Step 2: Check for duplicates
-            record_hash = self._generate_record_hash(validated_record)
-            is_duplicate = await self.mongo_service.check_duplicate(record_hash)
+            is_duplicate = record_hash in chunk_hashes or record_hash in existing_hashes
             
             if is_duplicate:
-                logger.info(
-                    "Duplicate record detected, skipping",
-                    record_id=record_id,
-                    patient_id=validated_record.get("patient_id"),
-                    record_hash=record_hash
-                )
-                return {
-                    "record_id": record_id,
-                    "status": "duplicate",
-                    "record_hash": record_hash
-                }
+                if DEBUG_ENABLED:
+                    logger.debug(
+                        "Duplicate record detected, skipping",
+                        patient_id=validated_record.get("patient_id"),
+                        record_hash=record_hash
+                    )
+                duplicate_count += 1
+                results[index] = DUPLICATE
+                continue
             
-            # Step 3: Store in MongoDB
-            try:
-                stored_id = await self.mongo_service.insert_record({
+            add_chunk_hash(record_hash)
+            add_pending((index, validated_record, record_hash))
+        
+        if duplicate_count:
+            logger.info(
+                "Duplicate records skipped",
+                processing_id=processing_id,
+                duplicate_records=duplicate_count
+            )
+        
+        if not pending:
+            return results, []
+        
+        # Step 3: Store the remaining records in MongoDB in one batch
+        try:
+            stored_ids = await self.mongo_service.insert_records_batch([
+                {
                     **validated_record,
                     "record_hash": record_hash,
                     "processing_id": processing_id
-                })
-                
-                logger.info(
-                    "Record stored successfully",
-                    record_id=record_id,
-                    stored_id=stored_id,
-                    patient_id=validated_record.get("patient_id")
-                )
-                
-            except Exception as storage_error:
-                logger.error(
-                    "Failed to store record",
-                    record_id=record_id,
-                    error=str(storage_error)
-                )
-                return {
-                    "record_id": record_id,
-                    "status": "storage_error",
-                    "error": str(storage_error)
                 }
+                for _, validated_record, record_hash in pending
+            ])
+            
+            add_seen_hash = seen_hashes.add
+            for _, _, record_hash in pending:
+                add_seen_hash(record_hash)
+            self._remember_hashes(record_hash for _, _, record_hash in pending)
+            
+            logger.info(
+                "Records stored successfully",
+                processing_id=processing_id,
+                stored_records=len(stored_ids)
+            )
+            
+        except Exception as storage_error:
+            logger.error(
+                "Failed to store records",
+                processing_id=processing_id,
+                batch_size=len(pending),
+                error=str(storage_error)
+            )
+            storage_failed = ("storage_error", str(storage_error))
+            for index, _, _ in pending:
+                results[index] = storage_failed
+            return results, []
+        
+        stored = [
+            (index, stored_id, validated_record)
+            for (index, validated_record, _), stored_id in zip(pending, stored_ids)
+        ]
+        return results, stored
+    
+    async def _submit_chunk(
+        self,
+        results: List[Optional[RecordResult]],
+        stored: List[Tuple[int, str, Dict[str, Any]]],
+        processing_id: str
+    ) -> List[RecordResult]:
+        """
+        Submit a stored chunk to OpenMRS and record the outcomes in MongoDB.
+        
+        Submissions run concurrently, bounded across all in-flight chunks
+        by ``openmrs_concurrency``, and their outcomes are written back in
+        one ``mark_batch_results`` call, so a chunk costs about
+        ceil(n / concurrency) OpenMRS round trips and a single database write.
+        
+        Args:
+            results: Processing results from ``_store_chunk`` (updated in place)
+            stored: Stored records from ``_store_chunk``
+            processing_id: Processing session ID
+            
+        Returns:
+            List[RecordResult]: Processing result for each record, in input
+            order, followed by the error of a failed results write, if any
+        """
+        if not stored:
+            return results
+        
+        # Step 1: Submit stored records to OpenMRS concurrently
+        submit_record = self._submit_record
+        submissions = await asyncio.gather(
+            *[
+                submit_record(stored_id, validated_record)
+                for _, stored_id, validated_record in stored
+            ],
+            return_exceptions=True
+        )
+        
+        submitted: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, str] = {}
+        for (index, stored_id, _), submission in zip(stored, submissions):
+            if isinstance(submission, Exception):
+                results[index] = submission
+                continue
             
-            # Step 4: Submit to OpenMRS
+            # Only successful submissions carry an OpenMRS submission result
+            result, submission_result = submission
+            if submission_result is not None:
+                submitted[stored_id] = submission_result
+            elif result[0] == "submission_error":
+                failed[stored_id] = result[1]
+            results[index] = result
+        
+        logger.info(
+            "Chunk submitted to OpenMRS",
+            processing_id=processing_id,
+            submitted_records=len(submitted),
+            failed_records=len(failed)
+        )
+        
+        # Step 2: Record the submission outcomes in MongoDB in one batch
+        if submitted or failed:
             try:
-                submission_result = await self.openmrs_client.submit_tm2_record(validated_record)
-                
-                # Update record status in MongoDB
-                await self.mongo_service.mark_as_submitted(stored_id, submission_result)
-                
-                logger.info(
-                    "Record submitted successfully",
-                    record_id=record_id,
-                    stored_id=stored_id,
-                    submission_id=submission_result.get("submission_id"),
-                    patient_id=validated_record.get("patient_id")
+                await self.mongo_service.mark_batch_results(submitted, failed)
+            except Exception as e:
+                log_exception(
+                    logger,
+                    "Failed to record submission results",
+                    processing_id=processing_id,
+                    error=str(e)
                 )
+                # The records keep their submission results; the failed
+                # write is reported once as a batch error
+                results.append(e)
+        
+        return results
+    
+    async def _submit_record(
+        self,
+        stored_id: str,
+        validated_record: Dict[str, Any]
+    ) -> Tuple[RecordResult, Optional[Dict[str, Any]]]:
+        """
+        Submit a stored TM2 record to OpenMRS.
+        
+        The outcome is not written to MongoDB here; the caller records the
+        outcomes of a whole chunk in one batch.
+        
+        Args:
+            stored_id: MongoDB record ID
+            validated_record: Validated record dictionary
+            
+        Returns:
+            Tuple: Processing result for the record, and the OpenMRS
+            submission result if the submission succeeded
+        """
+        try:
+            try:
+                async with self._submit_semaphore:
+                    submission_result = await self.openmrs_client.submit_tm2_record(validated_record)
                 
-                return {
-                    "record_id": record_id,
-                    "status": "submitted",
-                    "stored_id": stored_id,
-                    "submission_id": submission_result.get("submission_id")
-                }
+                if DEBUG_ENABLED:
+                    logger.debug(
+                        "Record submitted successfully",
+                        stored_id=stored_id,
+                        submission_id=submission_result.get("submission_id"),
+                        patient_id=validated_record.get("patient_id")
+                    )
                 
-            except Exception as submission_error:
-                # Mark as failed in MongoDB
-                await self.mongo_service.mark_as_failed(stored_id, str(submission_error))
+                return SUBMITTED, submission_result
                 
+            except Exception as submission_error:
                 logger.error(
                     "Failed to submit record to OpenMRS",
-                    record_id=record_id,
                     stored_id=stored_id,
                     error=str(submission_error)
                 )
                 
-                return {
-                    "record_id": record_id,
-                    "status": "submission_error",
-                    "stored_id": stored_id,
-                    "error": str(submission_error)
-                }
+                return ("submission_error", str(submission_error)), None
         
         except Exception as e:
-            logger.error(
+            log_exception(
+                logger,
                 "Unexpected error processing record",
-                record_id=record_id,
-                error=str(e),
-                exc_info=True
+                stored_id=stored_id,
+                error=str(e)
             )
-            return {
-                "record_id": record_id,
-                "status": "processing_error",
-                "error": str(e)
-            }
+            return ("processing_error", str(e)), None
     
-    async def _validate_and_transform_record(
-        self, 
-        raw_record: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
+    async def load_seen_hashes(self) -> None:
         """
-        Validate and transform a raw TM2 record.
+        Build the duplicate pre-check filter from records already stored.
         
-        Args:
-            raw_record: Raw record dictionary
-            
-        Returns:
-            Optional[Dict]: Validated and transformed record, or None if invalid
+        Called once at startup so the first upload does not pay for the
+        scan; uploads fall back to loading it if startup did not.
         """
-        try:
-            # Create and validate raw record model
-            raw_model = TM2RawRecord(**raw_record)
-            
-            # Transform to processed record
-            processed_data = {
-                "patient_id": raw_model.patient_id,
-                "tm2_code": raw_model.tm2_code,
-                "condition_name": raw_model.condition_name,
-                "system_type": raw_model.system_type,
-                "severity": raw_model.severity,
-                "practitioner_id": raw_model.practitioner_id,
-                "diagnosis_date": self._parse_date(raw_model.diagnosis_date),
-                "created_at": datetime.utcnow(),
-                "source_file": "uploaded_file"
-            }
-            
-            # Validate processed record
-            processed_model = TM2ProcessedRecord(**processed_data)
-            
-            logger.debug(
-                "Record validated successfully",
-                patient_id=processed_model.patient_id,
-                tm2_code=processed_model.tm2_code
-            )
-            
-            return processed_model.model_dump()
-            
-        except Exception as e:
-            logger.warning(
-                "Record validation failed",
-                patient_id=raw_record.get("patient_id"),
-                error=str(e)
-            )
-            return None
+        seen_hashes = ScalableBloomFilter(
+            initial_capacity=settings.dedup_filter_capacity,
+            error_rate=settings.dedup_filter_error_rate
+        )
+        async for record_hash in self.mongo_service.iter_record_hashes():
+            seen_hashes.add(record_hash)
+        
+        self._seen_hashes = seen_hashes
+        
+        logger.info("Duplicate pre-check filter loaded", stored_hashes=seen_hashes.count)
     
-    def _parse_date(self, date_string: str) -> datetime:
+    def _remember_hashes(self, record_hashes: Iterable[str]) -> None:
         """
-        Parse date string into datetime object.
+        Record hashes known to be stored, evicting the least recently used.
         
         Args:
-            date_string: Date string in various formats
-            
-        Returns:
-            datetime: Parsed datetime object
+            record_hashes: Hashes of stored records
         """
-        try:
-            return date_parser.parse(date_string)
-        except Exception:
-            # Return current date if parsing fails
-            logger.warning(f"Failed to parse date: {date_string}, using current date")
-            return datetime.utcnow()
+        known_hashes = self._known_hashes
+        move_to_end = known_hashes.move_to_end
+        for record_hash in record_hashes:
+            key = record_hash_key(record_hash)
+            known_hashes[key] = None
+            move_to_end(key)
+        
+        for _ in range(len(known_hashes) - settings.dedup_cache_size):
+            known_hashes.popitem(last=False)
     
-    def _generate_record_hash(self, record: Dict[str, Any]) -> str:
+    @staticmethod
+    def _hash_records(records: List[Optional[Dict[str, Any]]]) -> List[Optional[str]]:
         """
-        Generate a normalized hash for duplicate detection.
+        Generate the normalized duplicate-detection hash of every record in a chunk.
+        
+        Hashes cover the patient ID, TM2 code and diagnosis date, and are
+        computed in one pass with the hash constructor bound once. A chunk
+        holds few distinct diagnosis dates, so each date is formatted once
+        and reused; formatting dates otherwise costs more than hashing.
         
         Args:
-            record: Record dictionary
+            records: Record dictionaries, None where validation failed
             
         Returns:
-            str: SHA-256 hash of normalized record
+            List[Optional[str]]: SHA-256 hashes in input order, None for missing records
         """
-        # Create normalized string from key fields
-        normalized_data = f"{record['patient_id']}|{record['tm2_code']}|{record['diagnosis_date']}"
-        
-        # Generate hash
-        record_hash = hashlib.sha256(normalized_data.encode()).hexdigest()
+        sha256 = hashlib.sha256
+        date_strings: Dict[datetime, str] = {}
+        record_hashes: List[Optional[str]] = []
+        append_hash = record_hashes.append
+        for record in records:
+            if not record:
+                append_hash(None)
+                continue
+            
+            diagnosis_date = record['diagnosis_date']
+            date_string = date_strings.get(diagnosis_date)
+            if date_string is None:
+                date_string = date_strings[diagnosis_date] = str(diagnosis_date)
+            
+            append_hash(sha256(
+                f"{record['patient_id']}|{record['tm2_code']}|{date_string}".encode()
+            ).hexdigest())
         
-        logger.debug(
-            "Record hash generated",
-            normalized_data=normalized_data,
-            record_hash=record_hash[:16]  # Log first 16 characters
-        )
+        if DEBUG_ENABLED:
+            logger.debug("Record hashes generated", hashed_records=len(record_hashes))
         
-        return record_hash
+        return record_hashes
     
     def _update_processing_stats(self, batch_results: Dict[str, Any]) -> None:
         """
@@ -574,14 +1404,8 @@ class TM2IngestionService:
             batch_results: Batch processing results
         """
         self.processing_stats["files_processed"] += 1
-        self.processing_stats["records_processed"] += batch_results["processed_records"]
-        self.processing_stats["records_validated"] += batch_results["validated_records"]
-        self.processing_stats["records_stored"] += batch_results["stored_records"]
-        self.processing_stats["records_submitted"] += batch_results["submitted_records"]
-        self.processing_stats["validation_errors"] += batch_results["validation_errors"]
-        self.processing_stats["storage_errors"] += batch_results["storage_errors"]
-        self.processing_stats["submission_errors"] += batch_results["submission_errors"]
-        self.processing_stats["duplicate_records"] += batch_results["duplicate_records"]
+        for stat, counter in PROCESSING_STAT_COUNTERS.items():
+            self.processing_stats[stat] += batch_results[counter]
     
     async def get_processing_status(self) -> Dict[str, Any]:
         """
@@ -601,4 +1425,13 @@ class TM2IngestionService:
             "openmrs_statistics": openmrs_stats
         }
         
-        return status
\ No newline at end of file
+        return status
+    
+    async def close(self) -> None:
+        """
+        Release worker processes used for validation.
+        """
+        if self._validation_pool is not None:
+            logger.info("Shutting down validation worker pool")
+            self._validation_pool.shutdown(wait=True, cancel_futures=True)
+            self._validation_pool = None
@@ -4,20 +4,45 @@ Mock MongoDB service for development and testing.
 This module provides an in-memory implementation of MongoDB operations
 that simulates the behavior of a real MongoDB database for testing
 and development purposes.
+
+Methods stay coroutines, matching the Motor-based service this mock
+stands in for. Awaiting one that never suspends does not yield to the
+event loop, and the ingestion pipeline calls them once per chunk rather
+than once per record.
 """
 
 import asyncio
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Set
 from uuid import uuid4
 
-from app.core.logging import get_logger
+from app.core.logging import get_logger, DEBUG_ENABLED, INFO_ENABLED
 from app.core.config import get_settings
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 
+def record_hash_key(record_hash: str) -> int:
+    """
+    Get the 64-bit index key of a record hash.
+    
+    The key is the leading 64 bits of the SHA-256 digest as a signed
+    integer, so it is stored as a BSON long instead of a 64-character hex
+    string. Keys of different hashes can collide, so a key match is
+    confirmed against the record's full ``record_hash``.
+    
+    Args:
+        record_hash: Hex SHA-256 record hash
+        
+    Returns:
+        int: Signed 64-bit key
+    """
+    return int.from_bytes(bytes.fromhex(record_hash[:16]), "big", signed=True)
+
+
 class MongoService:
     """
     Mock MongoDB service using in-memory dictionary storage.
@@ -26,14 +51,37 @@ class MongoService:
     without requiring an actual MongoDB connection. It maintains data
     consistency during the application lifecycle and provides realistic
     MongoDB-like behavior.
+    
+    Records are kept as whole documents keyed by ID, as MongoDB stores
+    them. Lookups by hash or status go through indexes maintained on
+    every write, so no operation scans the collection.
     """
     
     def __init__(self):
         """Initialize the mock MongoDB service."""
         self._data: Dict[str, Dict[str, Any]] = {}
+        
+        # Records collection, bound once the mock database is initialized
+        self._collection: Dict[str, Dict[str, Any]] = {}
+        
+        # 64-bit record hash key to the IDs of records with that key,
+        # mirroring a non-unique index on the key; keys of different hashes
+        # can collide, so the full record_hash is compared on a match
+        self._hash_index: Dict[int, List[str]] = {}
+        
+        # Record IDs bucketed by status, each bucket in insertion order
+        self._by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
         self._initialized = False
         self._connection_status = "disconnected"
         
+        # Connection pool options, in the form a Motor client accepts them
+        self._client_options = {
+            "maxPoolSize": settings.mongo_max_pool_size,
+            "minPoolSize": settings.mongo_min_pool_size,
+            "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+            "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms
+        }
+        
         # Statistics tracking
         self._stats = {
             "total_records": 0,
@@ -53,14 +101,19 @@ class MongoService:
             logger.info("Establishing mock MongoDB connection")
             
             # Simulate connection delay
-            await asyncio.sleep(0.1)
+            if settings.simulated_latency_seconds:
+                await asyncio.sleep(settings.simulated_latency_seconds)
             
             # Initialize mock database structure
             self._data = {
                 settings.collection_name: {},
                 "metadata": {},
-                "processing_status": {}
+                "processing_status": {},
+                "ingestion_cache": {}
             }
+            self._collection = self._data[settings.collection_name]
+            self._hash_index = {}
+            self._by_status = defaultdict(dict)
             
             self._connection_status = "connected"
             self._initialized = True
@@ -69,7 +122,8 @@ class MongoService:
                 "Mock MongoDB service initialized successfully",
                 database_name=settings.database_name,
                 collection_name=settings.collection_name,
-                connection_status=self._connection_status
+                connection_status=self._connection_status,
+                **self._client_options
             )
             
         except Exception as e:
@@ -97,32 +151,102 @@ class MongoService:
         record_id = str(uuid4())
         
         # Add metadata
+        now = datetime.utcnow()
         enhanced_record = {
             **record,
             "_id": record_id,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            "created_at": now,
+            "updated_at": now,
             "status": "pending",
             "submission_attempts": 0,
             "submitted_to_openmrs": False
         }
         
         # Store in mock database
-        self._data[settings.collection_name][record_id] = enhanced_record
+        self._collection[record_id] = enhanced_record
+        self._by_status["pending"][record_id] = None
+        if record_hash := record.get("record_hash"):
+            self._hash_index.setdefault(record_hash_key(record_hash), []).append(record_id)
         
         # Update statistics
         self._stats["total_records"] += 1
         self._stats["pending_records"] += 1
         
-        logger.info(
-            "Record inserted successfully",
-            record_id=record_id,
-            patient_id=record.get("patient_id"),
-            tm2_code=record.get("tm2_code")
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Record inserted successfully",
+                record_id=record_id,
+                patient_id=record.get("patient_id"),
+                tm2_code=record.get("tm2_code")
+            )
         
         return record_id
     
+    async def insert_records_batch(self, records: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert a batch of records into the mock database in one operation.
+        
+        This mirrors a single ``insert_many(records, ordered=False)`` call
+        instead of one insert per record; the ingestion service calls it
+        once per parsed batch.
+        
+        Args:
+            records: Dictionaries containing the record data
+            
+        Returns:
+            List[str]: Unique record IDs, in input order
+            
+        Raises:
+            RuntimeError: If service is not initialized
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        collection = self._collection
+        index_hash = self._hash_index.setdefault
+        pending = self._by_status["pending"]
+        now = datetime.utcnow()
+        record_ids = []
+        
+        for record in records:
+            record_id = str(uuid4())
+            if record_hash := record.get("record_hash"):
+                index_hash(record_hash_key(record_hash), []).append(record_id)
+            collection[record_id] = {
+                **record,
+                "_id": record_id,
+                "created_at": now,
+                "updated_at": now,
+                "status": "pending",
+                "submission_attempts": 0,
+                "submitted_to_openmrs": False
+            }
+            pending[record_id] = None
+            record_ids.append(record_id)
+        
+        # Update statistics
+        self._stats["total_records"] += len(record_ids)
+        self._stats["pending_records"] += len(record_ids)
+        
+        logger.info("Record batch inserted successfully", inserted_count=len(record_ids))
+        
+        return record_ids
+    
+    def _index_status(self, record_id: str, old_status: Optional[str], new_status: str) -> None:
+        """
+        Move a record ID between status buckets.
+        
+        Args:
+            record_id: Unique record identifier
+            old_status: Current status of the record
+            new_status: Status the record is moving to
+        """
+        if old_status == new_status:
+            return
+        if old_status is not None:
+            self._by_status[old_status].pop(record_id, None)
+        self._by_status[new_status][record_id] = None
+    
     async def get_record(self, record_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a record by ID from the mock database.
@@ -136,10 +260,11 @@ class MongoService:
         if not self._initialized:
             raise RuntimeError("MongoDB service not initialized")
         
-        record = self._data[settings.collection_name].get(record_id)
+        record = self._collection.get(record_id)
         
         if record:
-            logger.debug("Record retrieved successfully", record_id=record_id)
+            if DEBUG_ENABLED:
+                logger.debug("Record retrieved successfully", record_id=record_id)
         else:
             logger.warning("Record not found", record_id=record_id)
         
@@ -159,20 +284,23 @@ class MongoService:
         if not self._initialized:
             raise RuntimeError("MongoDB service not initialized")
         
-        if record_id not in self._data[settings.collection_name]:
+        record = self._collection.get(record_id)
+        if record is None:
             logger.warning("Cannot update record - not found", record_id=record_id)
             return False
         
         # Apply updates
-        record = self._data[settings.collection_name][record_id]
+        if "status" in updates:
+            self._index_status(record_id, record.get("status"), updates["status"])
         record.update(updates)
         record["updated_at"] = datetime.utcnow()
         
-        logger.info(
-            "Record updated successfully",
-            record_id=record_id,
-            updated_fields=list(updates.keys())
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Record updated successfully",
+                record_id=record_id,
+                updated_fields=list(updates.keys())
+            )
         
         return True
     
@@ -187,27 +315,34 @@ class MongoService:
         Returns:
             bool: True if record was updated, False if not found
         """
-        updates = {
-            "status": "submitted",
-            "submitted_to_openmrs": True,
-            "openmrs_submission_result": submission_result,
-            "submission_timestamp": datetime.utcnow()
-        }
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
         
-        success = await self.update_record(record_id, updates)
+        record = self._collection.get(record_id)
+        if record is None:
+            logger.warning("Cannot update record - not found", record_id=record_id)
+            return False
         
-        if success:
-            # Update statistics
-            self._stats["submitted_records"] += 1
-            self._stats["pending_records"] -= 1
-            
-            logger.info(
+        now = datetime.utcnow()
+        self._index_status(record_id, record["status"], "submitted")
+        record["status"] = "submitted"
+        record["submitted_to_openmrs"] = True
+        record["openmrs_submission_result"] = submission_result
+        record["submission_timestamp"] = now
+        record["updated_at"] = now
+        
+        # Update statistics
+        self._stats["submitted_records"] += 1
+        self._stats["pending_records"] -= 1
+        
+        if DEBUG_ENABLED:
+            logger.debug(
                 "Record marked as submitted",
                 record_id=record_id,
                 openmrs_id=submission_result.get("id")
             )
         
-        return success
+        return True
     
     async def mark_as_failed(self, record_id: str, error_message: str) -> bool:
         """
@@ -220,26 +355,103 @@ class MongoService:
         Returns:
             bool: True if record was updated, False if not found
         """
-        updates = {
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        record = self._collection.get(record_id)
+        if record is None:
+            logger.warning("Cannot update record - not found", record_id=record_id)
+            return False
+        
+        now = datetime.utcnow()
+        self._index_status(record_id, record["status"], "failed")
+        record["status"] = "failed"
+        record["error_message"] = error_message
+        record["failure_timestamp"] = now
+        record["updated_at"] = now
+        
+        # Update statistics
+        self._stats["failed_records"] += 1
+        self._stats["pending_records"] -= 1
+        
+        logger.warning(
+            "Record marked as failed",
+            record_id=record_id,
+            error_message=error_message
+        )
+        
+        return True
+    
+    async def mark_batch_results(
+        self,
+        submitted: Dict[str, Dict[str, Any]],
+        failed: Dict[str, str]
+    ) -> int:
+        """
+        Record the OpenMRS outcome of a batch of records in one operation.
+        
+        This mirrors a single unordered ``bulk_write`` of ``UpdateOne``
+        operations instead of one update per record.
+        
+        Args:
+            submitted: Record IDs mapped to their OpenMRS submission results
+            failed: Record IDs mapped to their submission error messages
+            
+        Returns:
+            int: Number of records updated
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        collection = self._collection
+        now = datetime.utcnow()
+        submitted_count = 0
+        failed_count = 0
+        
+        # Fields shared by every update of the batch are built once
+        submitted_fields = {
+            "status": "submitted",
+            "submitted_to_openmrs": True,
+            "submission_timestamp": now,
+            "updated_at": now
+        }
+        failed_fields = {
             "status": "failed",
-            "error_message": error_message,
-            "failure_timestamp": datetime.utcnow()
+            "failure_timestamp": now,
+            "updated_at": now
         }
         
-        success = await self.update_record(record_id, updates)
+        index_status = self._index_status
+        for record_id, submission_result in submitted.items():
+            record = collection.get(record_id)
+            if record is None:
+                continue
+            index_status(record_id, record["status"], "submitted")
+            record.update(submitted_fields)
+            record["openmrs_submission_result"] = submission_result
+            submitted_count += 1
+        
+        for record_id, error_message in failed.items():
+            record = collection.get(record_id)
+            if record is None:
+                continue
+            index_status(record_id, record["status"], "failed")
+            record.update(failed_fields)
+            record["error_message"] = error_message
+            failed_count += 1
         
-        if success:
-            # Update statistics
-            self._stats["failed_records"] += 1
-            self._stats["pending_records"] -= 1
-            
-            logger.warning(
-                "Record marked as failed",
-                record_id=record_id,
-                error_message=error_message
-            )
+        # Update statistics
+        self._stats["submitted_records"] += submitted_count
+        self._stats["failed_records"] += failed_count
+        self._stats["pending_records"] -= submitted_count + failed_count
         
-        return success
+        logger.info(
+            "Record batch results recorded",
+            submitted_count=submitted_count,
+            failed_count=failed_count
+        )
+        
+        return submitted_count + failed_count
     
     async def get_pending_records(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -249,23 +461,21 @@ class MongoService:
             limit: Maximum number of records to return
             
         Returns:
-            List[Dict]: List of pending records
+            List[Dict]: List of pending records, oldest first
         """
         if not self._initialized:
             raise RuntimeError("MongoDB service not initialized")
         
-        pending_records = [
-            record for record in self._data[settings.collection_name].values()
-            if record.get("status") == "pending"
-        ]
-        
-        # Sort by creation date and limit results
-        pending_records.sort(key=lambda x: x["created_at"])
-        limited_records = pending_records[:limit]
+        # Records enter the pending bucket as they are inserted, so it is
+        # already ordered by creation date and no sort or heap is needed; a
+        # record set back to pending is queued behind the others
+        collection = self._collection
+        pending_ids = self._by_status["pending"]
+        limited_records = [collection[record_id] for record_id in islice(pending_ids, limit)]
         
         logger.info(
             "Retrieved pending records",
-            total_pending=len(pending_records),
+            total_pending=len(pending_ids),
             returned_count=len(limited_records)
         )
         
@@ -281,13 +491,14 @@ class MongoService:
         if not self._initialized:
             raise RuntimeError("MongoDB service not initialized")
         
-        # Recalculate statistics to ensure accuracy
-        collection = self._data[settings.collection_name]
-        
-        status_counts = {}
-        for record in collection.values():
-            status = record.get("status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Status counts are read off the status buckets, which every insert
+        # and status change keeps current
+        collection = self._collection
+        status_counts = {
+            status: len(record_ids)
+            for status, record_ids in self._by_status.items()
+            if record_ids
+        }
         
         stats = {
             **self._stats,
@@ -297,7 +508,8 @@ class MongoService:
             "last_updated": datetime.utcnow()
         }
         
-        logger.debug("Database statistics retrieved", **stats)
+        if DEBUG_ENABLED:
+            logger.debug("Database statistics retrieved", **stats)
         
         return stats
     
@@ -314,18 +526,146 @@ class MongoService:
         if not self._initialized:
             raise RuntimeError("MongoDB service not initialized")
         
-        collection = self._data[settings.collection_name]
+        existing_id = self._find_record_id(record_hash)
+        if existing_id is None:
+            return False
+        
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Duplicate record detected",
+                record_hash=record_hash,
+                existing_id=existing_id
+            )
+        return True
+    
+    async def get_by_hash(self, record_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a record by its duplicate-detection hash.
+        
+        Args:
+            record_hash: Normalized hash of the record
+            
+        Returns:
+            Optional[Dict]: Record data if found, None otherwise
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        record_id = self._find_record_id(record_hash)
+        if record_id is None:
+            return None
+        
+        return self._collection.get(record_id)
+    
+    def _find_record_id(self, record_hash: str) -> Optional[str]:
+        """
+        Look up the ID of the record with a given hash through the key index.
+        
+        Args:
+            record_hash: Normalized hash of the record
+            
+        Returns:
+            Optional[str]: Record ID if a record has this full hash, None otherwise
+        """
+        collection = self._collection
+        for record_id in self._hash_index.get(record_hash_key(record_hash), ()):
+            record = collection.get(record_id)
+            if record is not None and record.get("record_hash") == record_hash:
+                return record_id
+        
+        return None
+    
+    async def find_existing_hashes(self, record_hashes: Iterable[str]) -> Set[str]:
+        """
+        Find which of the given record hashes already exist, in one query.
+        
+        This mirrors a single ``{"record_hash": {"$in": hashes}}`` lookup
+        instead of one duplicate check per record.
+        
+        Args:
+            record_hashes: Normalized record hashes to look up
+            
+        Returns:
+            Set[str]: Hashes that belong to stored records
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        wanted = set(record_hashes)
+        if not wanted:
+            return set()
+        
+        find_record_id = self._find_record_id
+        existing = {record_hash for record_hash in wanted if find_record_id(record_hash) is not None}
+        
+        if existing:
+            logger.info(
+                "Duplicate records detected",
+                requested_count=len(wanted),
+                existing_count=len(existing)
+            )
+        
+        return existing
+    
+    async def get_cached_ingestion(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached ingestion result of a file.
+        
+        Entries older than ``ingest_cache_ttl_seconds`` are dropped on read,
+        as a TTL index on ``created_at`` would expire them.
+        
+        Args:
+            file_hash: SHA-256 hex digest of the file content
+            
+        Returns:
+            Optional[Dict]: Cached ingestion result, None if not cached
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        cache = self._data["ingestion_cache"]
+        entry = cache.get(file_hash)
+        if entry is None:
+            return None
+        
+        age = (datetime.utcnow() - entry["created_at"]).total_seconds()
+        if age >= settings.ingest_cache_ttl_seconds:
+            del cache[file_hash]
+            return None
         
-        for record in collection.values():
-            if record.get("record_hash") == record_hash:
-                logger.info(
-                    "Duplicate record detected",
-                    record_hash=record_hash,
-                    existing_id=record["_id"]
-                )
-                return True
+        return entry["result"]
+    
+    async def cache_ingestion(self, file_hash: str, result: Dict[str, Any]) -> None:
+        """
+        Cache the ingestion result of a file, replacing any earlier entry.
+        
+        Args:
+            file_hash: SHA-256 hex digest of the file content
+            result: Ingestion result to return for later uploads of the file
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
+        
+        self._data["ingestion_cache"][file_hash] = {
+            "_id": file_hash,
+            "result": result,
+            "created_at": datetime.utcnow()
+        }
+    
+    async def iter_record_hashes(self) -> AsyncIterator[str]:
+        """
+        Stream the duplicate-detection hash of every stored record.
+        
+        Yields:
+            str: Record hash
+        """
+        if not self._initialized:
+            raise RuntimeError("MongoDB service not initialized")
         
-        return False
+        collection = self._collection
+        for record_ids in list(self._hash_index.values()):
+            for record_id in record_ids:
+                yield collection[record_id]["record_hash"]
     
     async def close(self) -> None:
         """
@@ -338,11 +678,15 @@ class MongoService:
         
         try:
             # Log final statistics
-            final_stats = await self.get_statistics()
-            logger.info("Final database statistics", **final_stats)
+            if INFO_ENABLED:
+                final_stats = await self.get_statistics()
+                logger.info("Final database statistics", **final_stats)
             
             # Clear data
             self._data.clear()
+            self._collection = {}
+            self._hash_index.clear()
+            self._by_status.clear()
             self._initialized = False
             self._connection_status = "disconnected"
             
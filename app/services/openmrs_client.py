@@ -7,18 +7,62 @@ that simulates HTTP requests and responses without making actual external calls.
 
 import asyncio
 import base64
+import os
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from uuid import uuid4
 
 import httpx
 
-from app.core.logging import get_logger
+from app.core.logging import get_logger, DEBUG_ENABLED, INFO_ENABLED
 from app.core.config import get_settings
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Hex digits allowed at the start of the RFC 4122 variant field
+UUID_VARIANT_DIGITS = "89ab"
+
+
+@lru_cache(maxsize=32)
+def basic_auth_header(username: str, password: str) -> str:
+    """
+    Build the HTTP basic authentication header value for a set of credentials.
+    
+    Args:
+        username: API username
+        password: API password
+        
+    Returns:
+        str: ``Authorization`` header value
+    """
+    credentials = base64.b64encode(f"{username}:{password}".encode('ascii')).decode('ascii')
+    return f"Basic {credentials}"
+
+
+def random_uuids(count: int) -> List[str]:
+    """
+    Generate random (version 4) UUID strings from a single ``os.urandom`` call.
+    
+    Equivalent to calling ``str(uuid4())`` ``count`` times, without one
+    system call and one ``UUID`` object per identifier.
+    
+    Args:
+        count: Number of UUIDs to generate
+        
+    Returns:
+        List[str]: UUID strings in canonical form
+    """
+    digits = os.urandom(16 * count).hex()
+    uuids = []
+    for start in range(0, 32 * count, 32):
+        d = digits[start:start + 32]
+        variant = UUID_VARIANT_DIGITS[int(d[16], 16) & 3]
+        uuids.append(f"{d[:8]}-{d[8:12]}-4{d[13:16]}-{variant}{d[17:20]}-{d[20:]}")
+    return uuids
+
 
 class OpenMRSRestClient:
     """
@@ -45,11 +89,16 @@ class OpenMRSRestClient:
         self._initialized = False
         self._auth_header = None
         
-        # Mock data storage for simulating OpenMRS entities
-        self._mock_patients = {}
-        self._mock_concepts = {}
-        self._mock_encounters = {}
-        self._mock_observations = {}
+        # Mock data storage for simulating OpenMRS entities; each store keeps
+        # only the most recent ``openmrs_mock_store_size`` entities
+        self._mock_patients: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._mock_concepts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._mock_encounters: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._mock_observations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
+        # Metadata resources (identifier types, concept classes, datatypes)
+        # by display name; like in OpenMRS, each exists once and is shared
+        self._mock_metadata: Dict[str, Dict[str, str]] = {}
         
         # Statistics
         self._stats = {
@@ -75,14 +124,24 @@ class OpenMRSRestClient:
             )
             
             # Create basic auth header
-            auth_string = f"{self.username}:{self.password}"
-            auth_bytes = auth_string.encode('ascii')
-            auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
-            self._auth_header = f"Basic {auth_b64}"
+            self._auth_header = basic_auth_header(self.username, self.password)
             
-            # Simulate HTTP client creation (not actually making requests)
+            # Simulate HTTP client creation (not actually making requests).
+            # The pooled client is built once per process at startup and
+            # shared by every submission, so connections stay warm and
+            # requests inherit its base URL and headers.
             self._session = httpx.AsyncClient(
-                timeout=httpx.Timeout(30.0),
+                base_url=self.base_url,
+                http2=settings.openmrs_http2,
+                timeout=httpx.Timeout(
+                    settings.openmrs_timeout_seconds,
+                    connect=settings.openmrs_connect_timeout_seconds
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.openmrs_max_connections,
+                    max_keepalive_connections=settings.openmrs_max_keepalive_connections,
+                    keepalive_expiry=settings.openmrs_keepalive_expiry
+                ),
                 headers={
                     "Authorization": self._auth_header,
                     "Content-Type": "application/json",
@@ -91,7 +150,8 @@ class OpenMRSRestClient:
             )
             
             # Simulate connection test
-            await asyncio.sleep(0.1)
+            if settings.simulated_latency_seconds:
+                await asyncio.sleep(settings.simulated_latency_seconds)
             await self._mock_authentication_check()
             
             self._initialized = True
@@ -121,6 +181,38 @@ class OpenMRSRestClient:
         logger.info("Mock authentication successful")
         return True
     
+    @staticmethod
+    def _store_entity(store: "OrderedDict[str, Dict[str, Any]]", entity_uuid: str, entity: Dict[str, Any]) -> None:
+        """
+        Keep a mock entity, evicting the oldest one once the store is full.
+        
+        Args:
+            store: Mock entity store
+            entity_uuid: UUID of the entity
+            entity: Mock entity
+        """
+        if len(store) >= settings.openmrs_mock_store_size:
+            store.popitem(last=False)
+        store[entity_uuid] = entity
+    
+    def _metadata_resource(self, display: str) -> Dict[str, str]:
+        """
+        Get the shared reference to a mock metadata resource, creating it once.
+        
+        Args:
+            display: Display name of the resource
+            
+        Returns:
+            Dict: Resource reference with ``uuid`` and ``display``
+        """
+        resource = self._mock_metadata.get(display)
+        if resource is None:
+            resource = self._mock_metadata[display] = {
+                "uuid": random_uuids(1)[0],
+                "display": display
+            }
+        return resource
+    
     async def create_patient(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new patient in OpenMRS (mock implementation).
@@ -134,8 +226,8 @@ class OpenMRSRestClient:
         if not self._initialized:
             raise RuntimeError("OpenMRS client not initialized")
         
-        # Generate mock patient ID
-        patient_uuid = str(uuid4())
+        # Generate mock patient ID and the IDs of its nested resources
+        patient_uuid, identifier_uuid, name_uuid = random_uuids(3)
         
         # Create mock patient record
         mock_patient = {
@@ -143,12 +235,9 @@ class OpenMRSRestClient:
             "display": f"{patient_data.get('givenName', 'Unknown')} {patient_data.get('familyName', 'Patient')}",
             "identifiers": [
                 {
-                    "uuid": str(uuid4()),
-                    "identifier": patient_data.get("identifier", f"PAT{len(self._mock_patients) + 1:06d}"),
-                    "identifierType": {
-                        "uuid": str(uuid4()),
-                        "display": "OpenMRS ID"
-                    }
+                    "uuid": identifier_uuid,
+                    "identifier": patient_data.get("identifier", f"PAT{self._stats['patients_created'] + 1:06d}"),
+                    "identifierType": self._metadata_resource("OpenMRS ID")
                 }
             ],
             "person": {
@@ -157,7 +246,7 @@ class OpenMRSRestClient:
                 "birthdate": patient_data.get("birthdate"),
                 "names": [
                     {
-                        "uuid": str(uuid4()),
+                        "uuid": name_uuid,
                         "givenName": patient_data.get("givenName"),
                         "familyName": patient_data.get("familyName")
                     }
@@ -174,18 +263,19 @@ class OpenMRSRestClient:
         }
         
         # Store in mock database
-        self._mock_patients[patient_uuid] = mock_patient
+        self._store_entity(self._mock_patients, patient_uuid, mock_patient)
         
         # Update statistics
         self._stats["requests_made"] += 1
         self._stats["patients_created"] += 1
         
-        logger.info(
-            "Mock patient created successfully",
-            patient_uuid=patient_uuid,
-            identifier=mock_patient["identifiers"][0]["identifier"],
-            display_name=mock_patient["display"]
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Mock patient created successfully",
+                patient_uuid=patient_uuid,
+                identifier=mock_patient["identifiers"][0]["identifier"],
+                display_name=mock_patient["display"]
+            )
         
         return mock_patient
     
@@ -202,32 +292,26 @@ class OpenMRSRestClient:
         if not self._initialized:
             raise RuntimeError("OpenMRS client not initialized")
         
-        concept_uuid = str(uuid4())
+        concept_uuid, name_uuid, description_uuid = random_uuids(3)
         
         mock_concept = {
             "uuid": concept_uuid,
             "display": concept_data.get("display", "Unknown Concept"),
             "names": [
                 {
-                    "uuid": str(uuid4()),
+                    "uuid": name_uuid,
                     "name": concept_data.get("name", "Unknown"),
                     "conceptNameType": "FULLY_SPECIFIED"
                 }
             ],
             "descriptions": [
                 {
-                    "uuid": str(uuid4()),
+                    "uuid": description_uuid,
                     "description": concept_data.get("description", "No description available")
                 }
             ],
-            "conceptClass": {
-                "uuid": str(uuid4()),
-                "display": concept_data.get("conceptClass", "Misc")
-            },
-            "datatype": {
-                "uuid": str(uuid4()),
-                "display": concept_data.get("datatype", "Text")
-            },
+            "conceptClass": self._metadata_resource(concept_data.get("conceptClass", "Misc")),
+            "datatype": self._metadata_resource(concept_data.get("datatype", "Text")),
             "retired": False,
             "dateCreated": datetime.utcnow().isoformat(),
             "links": [
@@ -238,16 +322,17 @@ class OpenMRSRestClient:
             ]
         }
         
-        self._mock_concepts[concept_uuid] = mock_concept
+        self._store_entity(self._mock_concepts, concept_uuid, mock_concept)
         
         self._stats["requests_made"] += 1
         self._stats["concepts_created"] += 1
         
-        logger.info(
-            "Mock concept created successfully",
-            concept_uuid=concept_uuid,
-            display_name=mock_concept["display"]
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Mock concept created successfully",
+                concept_uuid=concept_uuid,
+                display_name=mock_concept["display"]
+            )
         
         return mock_concept
     
@@ -272,6 +357,7 @@ class OpenMRSRestClient:
             self._stats["failed_submissions"] += 1
             raise Exception("Concept is required for observation")
         
+        now_iso = datetime.utcnow().isoformat()
         mock_observation = {
             "uuid": observation_uuid,
             "display": f"Observation: {observation_data.get('concept', 'Unknown')}",
@@ -284,13 +370,13 @@ class OpenMRSRestClient:
                 "display": observation_data.get("personName", "Unknown Patient")
             },
             "value": observation_data.get("value"),
-            "obsDatetime": observation_data.get("obsDatetime", datetime.utcnow().isoformat()),
+            "obsDatetime": observation_data.get("obsDatetime", now_iso),
             "encounter": {
                 "uuid": observation_data.get("encounter"),
                 "display": "TM2 Data Ingestion Encounter"
             },
             "voided": False,
-            "dateCreated": datetime.utcnow().isoformat(),
+            "dateCreated": now_iso,
             "links": [
                 {
                     "rel": "self",
@@ -299,17 +385,18 @@ class OpenMRSRestClient:
             ]
         }
         
-        self._mock_observations[observation_uuid] = mock_observation
+        self._store_entity(self._mock_observations, observation_uuid, mock_observation)
         
         self._stats["requests_made"] += 1
         self._stats["successful_submissions"] += 1
         
-        logger.info(
-            "Mock observation submitted successfully",
-            observation_uuid=observation_uuid,
-            concept=observation_data.get("concept"),
-            patient=observation_data.get("person")
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Mock observation submitted successfully",
+                observation_uuid=observation_uuid,
+                concept=observation_data.get("concept"),
+                patient=observation_data.get("person")
+            )
         
         return mock_observation
     
@@ -318,7 +405,8 @@ class OpenMRSRestClient:
         Submit a complete TM2 record to OpenMRS (mock implementation).
         
         This method orchestrates the submission of patient data, concepts,
-        and observations in the correct sequence.
+        and observations in the correct sequence: the patient and concept
+        are created concurrently, then the observation linking them.
         
         Args:
             tm2_record: Complete TM2 record data
@@ -329,11 +417,12 @@ class OpenMRSRestClient:
         if not self._initialized:
             raise RuntimeError("OpenMRS client not initialized")
         
-        logger.info(
-            "Starting TM2 record submission",
-            patient_id=tm2_record.get("patient_id"),
-            tm2_code=tm2_record.get("tm2_code")
-        )
+        if DEBUG_ENABLED:
+            logger.debug(
+                "Starting TM2 record submission",
+                patient_id=tm2_record.get("patient_id"),
+                tm2_code=tm2_record.get("tm2_code")
+            )
         
         try:
             # Create or retrieve patient
@@ -343,7 +432,6 @@ class OpenMRSRestClient:
                 "familyName": tm2_record.get("patient_id", "Unknown"),
                 "gender": "U"  # Unknown gender as default
             }
-            patient_response = await self.create_patient(patient_data)
             
             # Create concept for TM2 code if needed
             concept_data = {
@@ -353,17 +441,25 @@ class OpenMRSRestClient:
                 "conceptClass": "Diagnosis",
                 "datatype": "Coded"
             }
-            concept_response = await self.create_concept(concept_data)
             
-            # Submit observation
+            # Patient and concept are independent, so both requests are in flight at once
+            patient_response, concept_response = await asyncio.gather(
+                self.create_patient(patient_data),
+                self.create_concept(concept_data)
+            )
+            
+            encounter_uuid, submission_id = random_uuids(2)
+            now_iso = datetime.utcnow().isoformat()
+            
+            # Submit observation once both are known
             observation_data = {
                 "concept": concept_response["uuid"],
                 "conceptName": concept_response["display"],
                 "person": patient_response["uuid"],
                 "personName": patient_response["display"],
                 "value": tm2_record.get("severity", "Unknown"),
-                "obsDatetime": tm2_record.get("diagnosis_date", datetime.utcnow().isoformat()),
-                "encounter": str(uuid4())  # Mock encounter
+                "obsDatetime": tm2_record.get("diagnosis_date", now_iso),
+                "encounter": encounter_uuid  # Mock encounter
             }
             observation_response = await self.submit_observation(observation_data)
             
@@ -373,19 +469,20 @@ class OpenMRSRestClient:
                 "patient": patient_response,
                 "concept": concept_response,
                 "observation": observation_response,
-                "submission_id": str(uuid4()),
-                "timestamp": datetime.utcnow().isoformat(),
+                "submission_id": submission_id,
+                "timestamp": now_iso,
                 "tm2_code": tm2_record.get("tm2_code"),
                 "patient_id": tm2_record.get("patient_id")
             }
             
-            logger.info(
-                "TM2 record submitted successfully",
-                submission_id=submission_result["submission_id"],
-                patient_uuid=patient_response["uuid"],
-                concept_uuid=concept_response["uuid"],
-                observation_uuid=observation_response["uuid"]
-            )
+            if DEBUG_ENABLED:
+                logger.debug(
+                    "TM2 record submitted successfully",
+                    submission_id=submission_result["submission_id"],
+                    patient_uuid=patient_response["uuid"],
+                    concept_uuid=concept_response["uuid"],
+                    observation_uuid=observation_response["uuid"]
+                )
             
             return submission_result
             
@@ -421,7 +518,8 @@ class OpenMRSRestClient:
             "last_updated": datetime.utcnow().isoformat()
         }
         
-        logger.debug("OpenMRS client statistics retrieved", **stats)
+        if DEBUG_ENABLED:
+            logger.debug("OpenMRS client statistics retrieved", **stats)
         
         return stats
     
@@ -433,8 +531,9 @@ class OpenMRSRestClient:
         
         try:
             # Log final statistics
-            final_stats = await self.get_statistics()
-            logger.info("Final OpenMRS client statistics", **final_stats)
+            if INFO_ENABLED:
+                final_stats = await self.get_statistics()
+                logger.info("Final OpenMRS client statistics", **final_stats)
             
             # Close HTTP session if it exists
             if self._session:
@@ -446,6 +545,7 @@ class OpenMRSRestClient:
             self._mock_concepts.clear()
             self._mock_encounters.clear()
             self._mock_observations.clear()
+            self._mock_metadata.clear()
             
             self._initialized = False
             
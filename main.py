@@ -7,18 +7,29 @@ and integrating with OpenMRS healthcare systems.
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from app.core.config import get_settings
 from app.core.lifespan import lifespan
 from app.api.endpoints import router
-from app.models.api_models import ErrorResponse
-from uuid import uuid4
+from app.api.internal import router as internal_router
+from app.core.ids import RequestIDMiddleware, get_request_id
+from app.core.logging import get_logger, log_exception
 from datetime import datetime
-import logging
 
-# Initialize settings
+import orjson
+
+# Initialize settings and logger
 settings = get_settings()
+logger = get_logger(__name__)
+
+# Interactive docs and the OpenAPI schema are only served in development;
+# building the schema walks every model and is not needed in production
+DEVELOPMENT = settings.environment == "development"
+
+# Allowed CORS origins, resolved once at import
+CORS_ORIGINS = ["*"] if DEVELOPMENT else ["https://yourdomain.com"]
 
 # Create FastAPI application with lifespan management
 app = FastAPI(
@@ -26,22 +37,46 @@ app = FastAPI(
     description="A production-ready service for processing TM2 dataset files and OpenMRS integration",
     version="1.0.0",
     lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    docs_url="/docs" if DEVELOPMENT else None,
+    redoc_url="/redoc" if DEVELOPMENT else None,
+    openapi_url="/openapi.json" if DEVELOPMENT else None,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"] if settings.environment == "development" else ["https://yourdomain.com"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger responses, such as status reports and record exports;
+# small bodies are sent as they are
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Assign each request a single identifier shared by endpoints, exception
+# handlers and the X-Request-ID response header
+app.add_middleware(RequestIDMiddleware)
+
 # Include API routes
 app.include_router(router, prefix="/api/v1")
+app.include_router(internal_router, prefix="/internal", tags=["internal"])
+
+# Bodies of the root and health endpoints never change while the
+# process runs, so they are serialized once at import
+ROOT_BODY = orjson.dumps({
+    "service": "TM2 Healthcare Data Ingestion Service",
+    "version": "1.0.0",
+    "status": "operational",
+    "docs": app.docs_url,
+    "environment": settings.environment
+})
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "tm2-healthcare-service"
+})
 
 # Root endpoint
 @app.get("/")
@@ -49,13 +84,7 @@ async def root():
     """
     Root endpoint providing service information.
     """
-    return {
-        "service": "TM2 Healthcare Data Ingestion Service",
-        "version": "1.0.0",
-        "status": "operational",
-        "docs": "/docs",
-        "environment": settings.environment
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 # Health check endpoint
 @app.get("/health")
@@ -63,36 +92,43 @@ async def health_check():
     """
     Health check endpoint for monitoring and load balancers.
     """
-    return {
-        "status": "healthy",
-        "service": "tm2-healthcare-service"
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 # Exception handlers moved here from router
 
+# Error bodies are built as plain dicts because every field is internally
+# sourced. Timestamps stay naive datetime objects: datetime.utcnow() plus
+# orjson's native datetime encoding is cheaper than formatting an ISO
+# string by hand.
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Custom handler for HTTP exceptions to provide consistent error responses.
     """
-    request_id = str(uuid4())
-    logging.warning(
-        f"HTTP exception occurred: status_code={exc.status_code}, detail={exc.detail}, request_id={request_id}"
-    )
-    return JSONResponse(
+    request_id = get_request_id(request)
+    logger.warning(
+        "HTTP exception occurred",
         status_code=exc.status_code,
-        content=ErrorResponse(
-            success=False,
-            message="Request failed",
-            error={
-                "error_code": f"HTTP_{exc.status_code}",
+        detail=exc.detail,
+        request_id=request_id
+    )
+    status_code = exc.status_code
+    return ORJSONResponse(
+        status_code=status_code,
+        content={
+            "success": False,
+            "message": "Request failed",
+            "timestamp": datetime.utcnow(),
+            "request_id": request_id,
+            "error": {
+                "error_code": f"HTTP_{status_code}",
                 "error_type": "HTTPException",
                 "message": str(exc.detail),
-                "details": exc.detail if isinstance(exc.detail, dict) else None
-            },
-            request_id=request_id,
-            timestamp=datetime.utcnow()
-        ).model_dump()
+                "details": exc.detail if isinstance(exc.detail, dict) else None,
+                "validation_errors": None
+            }
+        }
     )
 
 @app.exception_handler(Exception)
@@ -100,25 +136,29 @@ async def general_exception_handler(request: Request, exc: Exception):
     """
     Handler for unexpected exceptions to provide consistent error responses.
     """
-    request_id = str(uuid4())
-    logging.error(
-        f"Unexpected exception occurred: error_type={type(exc).__name__}, error_message={str(exc)}, request_id={request_id}",
-        exc_info=True
+    request_id = get_request_id(request)
+    log_exception(
+        logger,
+        "Unexpected exception occurred",
+        error_type=type(exc).__name__,
+        error_message=str(exc),
+        request_id=request_id
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
-        content=ErrorResponse(
-            success=False,
-            message="An unexpected error occurred",
-            error={
+        content={
+            "success": False,
+            "message": "An unexpected error occurred",
+            "timestamp": datetime.utcnow(),
+            "request_id": request_id,
+            "error": {
                 "error_code": "INTERNAL_ERROR",
                 "error_type": type(exc).__name__,
                 "message": "An internal server error occurred. Please try again later.",
-                "details": None  # Don't expose internal error details in production
-            },
-            request_id=request_id,
-            timestamp=datetime.utcnow()
-        ).model_dump()
+                "details": None,  # Don't expose internal error details in production
+                "validation_errors": None
+            }
+        }
     )
 
 if __name__ == "__main__":
@@ -128,6 +168,12 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.environment == "development",
-        log_level=settings.log_level.lower()
+        reload=DEVELOPMENT,
+        log_level=settings.log_level.lower(),
+        # uvloop and httptools come with uvicorn[standard]; naming them
+        # fails fast instead of silently falling back to asyncio and h11
+        loop="uvloop",
+        http="httptools",
+        timeout_keep_alive=settings.server_keepalive_timeout,
+        limit_concurrency=settings.server_limit_concurrency
     )
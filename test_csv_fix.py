@@ -1,152 +1,444 @@
 #!/usr/bin/env python3
 """
-Test script to verify CSV reading fixes for the TM2 ingestion service.
-This script tests the file pointer reset and encoding handling improvements.
+Tests for the TM2 ingestion service.
+These tests cover streamed parsing, record splitting and encoding handling,
+duplicate detection, the ingestion result cache, partial failures, the
+upload size limit, msgpack record transfer and request ID propagation.
+
+Run with ``pytest test_csv_fix.py`` from the repository root; pytest puts
+the test file's directory on the import path.
 """
 
-import asyncio
-import io
+from dataclasses import replace
+from datetime import datetime
 from pathlib import Path
 
-# Add the app directory to the path so we can import modules
-import sys
-sys.path.append('.')
+import msgpack
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
 
-from app.services.ingestion_service import TM2IngestionService
-from app.services.mongo_service import MongoService
+import main
+from app.api import endpoints
+from app.core import ids
+from app.core.config import get_settings
+from app.core.lifespan import get_mongo_service, get_openmrs_client
+from app.models.tm2_data import SeverityLevel, SystemType, TM2ProcessedRecord, asdict_fast
+from app.services.ingestion_service import FileTooLargeError, TM2IngestionService
+from app.services.mongo_service import MongoService, record_hash_key
 from app.services.openmrs_client import OpenMRSRestClient
 
+settings = get_settings()
 
-class MockMongoService(MongoService):
-    """Mock MongoDB service for testing."""
-
-    def __init__(self):
-        self.records = []
-        self.connection_status = "connected"
-
-    async def insert_record(self, record):
-        self.records.append(record)
-        return f"mock_id_{len(self.records)}"
-
-    async def check_duplicate(self, record_hash):
-        return False
-
-    async def mark_as_submitted(self, record_id, submission_result):
-        pass
+# Sample dataset, resolved relative to this file rather than the CWD
+SAMPLE_CSV_PATH = Path(__file__).parent / "data" / "sample_tm2_dataset.csv"
 
-    async def mark_as_failed(self, record_id, error):
-        pass
-
-    async def get_statistics(self):
-        return {
-            "connection_status": self.connection_status,
-            "total_records": len(self.records),
-            "submitted_records": len(self.records),
-            "failed_records": 0,
-            "pending_records": 0,
-            "collection_size": len(self.records),
-            "last_updated": "2023-01-01T00:00:00Z"
-        }
+HEADER = b"patient_id,tm2_code,condition_name,system_type,severity,diagnosis_date,practitioner_id\n"
 
 
 class MockOpenMRSClient(OpenMRSRestClient):
-    """Mock OpenMRS client for testing."""
+    """Mock OpenMRS client that counts submissions without building entities."""
 
     def __init__(self):
-        self.initialized = True
-        self.requests_made = 0
-        self.successful_submissions = 0
+        super().__init__(base_url="https://mock-openmrs.org", username="mock_user", password="mock_password")
+        self._initialized = True
+        self.submitted_records = []
 
     async def submit_tm2_record(self, record):
-        self.requests_made += 1
-        self.successful_submissions += 1
+        self.submitted_records.append(record)
+        self._stats["requests_made"] += 1
+        self._stats["successful_submissions"] += 1
         return {
-            "submission_id": f"mock_submission_{self.requests_made}",
+            "submission_id": f"mock_submission_{len(self.submitted_records)}",
             "status": "success"
         }
 
-    async def get_statistics(self):
-        return {
-            "initialized": self.initialized,
-            "base_url": "https://mock-openmrs.org",
-            "username": "mock_user",
-            "requests_made": self.requests_made,
-            "successful_submissions": self.successful_submissions,
-            "failed_submissions": 0,
-            "patients_created": self.successful_submissions,
-            "concepts_created": self.successful_submissions,
-            "last_updated": "2023-01-01T00:00:00Z"
-        }
 
+async def stream_bytes(payload, chunk_size=64):
+    """Yield payload in small chunks, like a streamed upload."""
+    for start in range(0, len(payload), chunk_size):
+        yield payload[start:start + chunk_size]
+
+
+async def read_records(ingestion_service, payload):
+    """Parse payload through the streaming CSV reader and collect records."""
+    records = []
+    async for frame in ingestion_service._read_csv_file(stream_bytes(payload)):
+        records.extend(ingestion_service._frame_to_records(frame))
+    return records
+
+
+def make_csv(count, start=0):
+    """Build a CSV payload with ``count`` valid, distinct data rows."""
+    rows = b"".join(
+        b"P%05d,TM2.A01.01,Condition %d,Ayurveda,Mild,2023-01-01,PRAC001\n" % (i, i)
+        for i in range(start, start + count)
+    )
+    return HEADER + rows
+
+
+async def process(ingestion_service, payload, file_hash=None):
+    """Run a payload through the full ingestion pipeline."""
+    return await ingestion_service.process_tm2_file(
+        stream_bytes(payload, chunk_size=4096), "upload.csv", file_hash=file_hash
+    )
+
+
+@pytest_asyncio.fixture
+async def mongo_service():
+    """Initialized in-memory MongoDB service."""
+    service = MongoService()
+    await service.initialize()
+    yield service
+    await service.close()
+
+
+@pytest.fixture
+def ingestion_service(mongo_service):
+    """Ingestion service wired to the in-memory MongoDB and mock OpenMRS services."""
+    return TM2IngestionService(mongo_service, MockOpenMRSClient())
+
+
+@pytest.fixture
+def client():
+    """Test client running the application lifespan."""
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def sample_csv():
+    """
+    Sample dataset bytes, read from disk once per test session.
+
+    The file is a few hundred bytes, so a plain read is cheaper than
+    mapping it; tests share the one ``bytes`` object.
+    """
+    if not SAMPLE_CSV_PATH.exists():
+        pytest.skip("Sample CSV file not found")
+    return SAMPLE_CSV_PATH.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_reads_sample_file(ingestion_service, sample_csv):
+    """Every data row of the sample dataset is read as a record."""
+    records = await read_records(ingestion_service, sample_csv)
+
+    data_rows = [line for line in sample_csv.splitlines()[1:] if line.strip()]
+    assert len(records) == len(data_rows)
+    assert records[0] is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "payload",
+    [b"", HEADER],
+    ids=["empty-file", "headers-only"]
+)
+async def test_rejects_files_without_data_rows(ingestion_service, payload):
+    """Files without data rows are rejected with a ValueError."""
+    with pytest.raises(ValueError):
+        await read_records(ingestion_service, payload)
+
+
+@pytest.mark.asyncio
+async def test_handles_utf8_bom(ingestion_service):
+    """A UTF-8 byte order mark does not end up in the first column name."""
+    payload = b"\xef\xbb\xbf" + HEADER + b"P001,TM2.A01.01,Test,Ayurveda,Mild,2023-01-01,PRAC001\n"
+
+    records = await read_records(ingestion_service, payload)
+
+    assert len(records) == 1
+    assert records[0]["patient_id"] == "P001"
+
+
+@pytest.mark.asyncio
+async def test_keeps_quoted_newline_across_chunks(ingestion_service):
+    """A quoted field containing a newline stays in one record across chunk boundaries."""
+    payload = (
+        HEADER
+        + b'P001,TM2.A01.01,"Chronic\nInsomnia",Ayurveda,Mild,2023-01-01,PRAC001\n'
+        + b"P002,TM2.A01.02,Sleep Apnea,Siddha,Severe,2023-01-02,PRAC002"
+    )
+
+    records = await read_records(ingestion_service, payload)
+
+    assert len(records) == 2
+    assert records[0]["condition_name"] == "Chronic\nInsomnia"
+
+
+@pytest.mark.asyncio
+async def test_stream_over_size_limit_is_rejected(ingestion_service, monkeypatch):
+    """A stream is cut off once it passes the configured size limit."""
+    monkeypatch.setattr(settings, "max_file_size_mb", 1)
+    payload = make_csv(20000)
+    assert len(payload) > 1024 * 1024
+
+    with pytest.raises(FileTooLargeError):
+        await read_records(ingestion_service, payload)
+
+
+def test_chunked_upload_over_size_limit_returns_413(client, monkeypatch):
+    """A chunked body without Content-Length is rejected with 413 mid-stream."""
+    monkeypatch.setattr(settings, "max_file_size_mb", 1)
+    payload = make_csv(20000)
+
+    def chunks():
+        for start in range(0, len(payload), 65536):
+            yield payload[start:start + 65536]
+
+    response = client.post("/api/v1/ingest/stream?filename=big.csv", content=chunks())
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_reupload_is_reported_as_duplicates(ingestion_service):
+    """Records already stored are counted as duplicates and not submitted again."""
+    payload = make_csv(250)
+
+    first = await process(ingestion_service, payload)
+    second = await process(ingestion_service, payload)
+
+    assert first["summary"]["submitted_records"] == 250
+    assert second["summary"]["duplicate_records"] == 250
+    assert second["summary"]["submitted_records"] == 0
+    assert len(ingestion_service.openmrs_client.submitted_records) == 250
+
+
+@pytest.mark.asyncio
+async def test_duplicate_rows_within_a_file_are_stored_once(ingestion_service):
+    """A row repeated inside one file is stored once."""
+    payload = make_csv(3) + b"P00001,TM2.A01.01,Condition 1,Ayurveda,Mild,2023-01-01,PRAC001\n"
+
+    result = await process(ingestion_service, payload)
+
+    assert result["summary"]["stored_records"] + result["summary"]["submitted_records"] == 3
+    assert result["summary"]["duplicate_records"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_hashes_are_loaded_into_a_new_service(mongo_service, ingestion_service):
+    """The duplicate pre-check filter is rebuilt from records already in MongoDB."""
+    payload = make_csv(50)
+    await process(ingestion_service, payload)
+
+    restarted = TM2IngestionService(mongo_service, MockOpenMRSClient())
+    await restarted.load_seen_hashes()
+    result = await process(restarted, payload)
+
+    assert restarted._seen_hashes.count == 50
+    assert result["summary"]["duplicate_records"] == 50
+
+
+@pytest.mark.asyncio
+async def test_known_hash_cache_is_bounded(ingestion_service, monkeypatch):
+    """The known-hash cache keeps at most dedup_cache_size keys and dedup still holds past it."""
+    monkeypatch.setattr(settings, "dedup_cache_size", 10)
+    payload = make_csv(50)
+
+    await process(ingestion_service, payload)
+    result = await process(ingestion_service, payload)
+
+    assert len(ingestion_service._known_hashes) == 10
+    assert all(isinstance(key, int) for key in ingestion_service._known_hashes)
+    assert result["summary"]["duplicate_records"] == 50
+
+
+@pytest.mark.asyncio
+async def test_hash_key_collisions_keep_both_records(mongo_service):
+    """Records whose hashes share a 64-bit key are both found by their full hash."""
+    first_hash = "ab" * 32
+    second_hash = "ab" * 8 + "cd" * 24
+    assert record_hash_key(first_hash) == record_hash_key(second_hash)
+
+    await mongo_service.insert_records_batch([{"record_hash": first_hash}])
+    await mongo_service.insert_records_batch([{"record_hash": second_hash}])
+
+    assert await mongo_service.find_existing_hashes([first_hash, second_hash, "00" * 32]) == {
+        first_hash, second_hash
+    }
+    assert sorted([h async for h in mongo_service.iter_record_hashes()]) == sorted([first_hash, second_hash])
+
+
+@pytest.mark.asyncio
+async def test_completed_ingestion_is_cached_by_file_hash(ingestion_service):
+    """A file re-uploaded with the same hash returns the earlier result."""
+    payload = make_csv(20)
+
+    first = await process(ingestion_service, payload, file_hash="a" * 64)
+    second = await process(ingestion_service, payload, file_hash="a" * 64)
+
+    assert second["cached"] is True
+    assert second["processing_id"] == first["processing_id"]
+    assert second["summary"] == first["summary"]
+    assert len(ingestion_service.openmrs_client.submitted_records) == 20
+
+
+@pytest.mark.asyncio
+async def test_ingestion_cache_can_be_disabled(ingestion_service, monkeypatch):
+    """With a zero TTL every upload is processed again."""
+    monkeypatch.setattr(settings, "ingest_cache_ttl_seconds", 0)
+    payload = make_csv(20)
+
+    await process(ingestion_service, payload, file_hash="b" * 64)
+    second = await process(ingestion_service, payload, file_hash="b" * 64)
+
+    assert "cached" not in second
+    assert second["summary"]["duplicate_records"] == 20
+
+
+@pytest.mark.asyncio
+async def test_failure_after_committed_batches_is_partial(ingestion_service, mongo_service):
+    """Batches committed before a parse failure are reported and counted."""
+    payload = make_csv(250) + b'P99999,"a"b"c,d,e,f,g,h,i,j\n'
+
+    result = await process(ingestion_service, payload)
+
+    assert result["status"] == "partial"
+    assert result["summary"]["submitted_records"] == 200
+    assert result["summary"]["errors"]
+    assert ingestion_service.processing_stats["files_processed"] == 1
+    assert ingestion_service.processing_stats["records_submitted"] == 200
+    assert (await mongo_service.get_statistics())["total_records"] == 200
+
+
+@pytest.mark.asyncio
+async def test_failure_before_any_batch_is_failed(ingestion_service):
+    """A file that fails before any batch is committed is reported as failed."""
+    result = await process(ingestion_service, b"patient_id,tm2_code\nP1,TM2.A01.01\n")
+
+    assert result["status"] == "failed"
+    assert "summary" not in result
+    assert ingestion_service.processing_stats["files_processed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_results_write_is_reported(ingestion_service, mongo_service, monkeypatch):
+    """Records keep their submission results when recording them fails."""
+    async def fail_mark_batch_results(submitted, failed):
+        raise RuntimeError("results write failed")
+
+    monkeypatch.setattr(mongo_service, "mark_batch_results", fail_mark_batch_results)
+
+    result = await process(ingestion_service, make_csv(5))
+
+    assert result["summary"]["submitted_records"] == 5
+    assert result["summary"]["processed_records"] == 5
+    assert result["summary"]["errors"] == ["results write failed"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("patient_id", [b"___", b"-"])
+async def test_ids_without_alphanumerics_are_rejected(ingestion_service, patient_id):
+    """IDs made only of underscores or hyphens fail validation."""
+    payload = HEADER + patient_id + b",TM2.A01.01,Test,Ayurveda,Mild,2023-01-01,PRAC001\n"
+
+    result = await process(ingestion_service, payload)
+
+    assert result["summary"]["validation_errors"] == 1
+    assert result["summary"]["submitted_records"] == 0
+
+
+def test_processed_record_round_trips_through_msgpack():
+    """A record decoded from its msgpack wire form equals the original."""
+    record = TM2ProcessedRecord(
+        patient_id="P001",
+        tm2_code="TM2.A01.01",
+        condition_name="Insomnia",
+        system_type=SystemType.SIDDHA,
+        severity=SeverityLevel.SEVERE,
+        diagnosis_date=datetime(2023, 1, 2),
+        practitioner_id="PRAC001",
+        created_at=datetime(2023, 1, 3, 4, 5, 6, 789000),
+        source_file="upload.csv",
+        icd11_category="Traditional Medicine - Disorders",
+        traditional_diagnosis=None
+    )
+
+    decoded = TM2ProcessedRecord.from_wire(msgpack.unpackb(record.to_msgpack()))
+
+    assert decoded == record
+
+
+def test_internal_export_requires_api_key(client, monkeypatch):
+    """Pending records are only exported to callers with the configured API key."""
+    path = "/internal/records/pending"
+    assert client.get(path).status_code == 403
+
+    monkeypatch.setattr(settings, "api_key", "test-key")
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"X-API-Key": "wrong"}).status_code == 401
+
+    record = TM2ProcessedRecord(
+        patient_id="P001",
+        tm2_code="TM2.A01.01",
+        condition_name="Insomnia",
+        system_type=SystemType.AYURVEDA,
+        severity=SeverityLevel.MILD,
+        diagnosis_date=datetime(2023, 1, 1),
+        practitioner_id="PRAC001",
+        created_at=datetime(2023, 1, 1)
+    )
+    client.portal.call(get_mongo_service().insert_records_batch, [asdict_fast(record)])
+
+    response = client.get(path, headers={"X-API-Key": "test-key"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-msgpack"
+    exported = [TM2ProcessedRecord.from_wire(wire) for wire in msgpack.unpackb(response.content)]
+    # Storage stamps its own created_at on insert
+    assert [replace(decoded, created_at=record.created_at) for decoded in exported] == [record]
+
+
+def test_health_check_uses_overridden_services(client, monkeypatch):
+    """The health check probes the services resolved through dependencies."""
+    class FailingOpenMRSClient(MockOpenMRSClient):
+        async def get_statistics(self):
+            raise RuntimeError("OpenMRS unreachable")
+
+    monkeypatch.setattr(endpoints, "_health_cache", None)
+    monkeypatch.setitem(main.app.dependency_overrides, get_openmrs_client, FailingOpenMRSClient)
+
+    response = client.get("/api/v1/health")
+
+    assert response.status_code == 200
+    assert response.json()["overall_status"] == "degraded"
+    assert response.json()["components"][1]["details"] == {"error": "OpenMRS unreachable"}
+
+
+@pytest.mark.parametrize("path", ["/api/v1/status", "/api/v1/health", "/api/v1/health"])
+def test_response_request_id_matches_header(client, path):
+    """The request ID in a response body is the one in its X-Request-ID header."""
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.json()["request_id"] == response.headers["x-request-id"]
+
+
+def test_error_request_id_matches_header(client):
+    """Error bodies carry the request's own ID."""
+    response = client.post("/api/v1/ingest/trigger", files={"file": ("notes.txt", b"x", "text/plain")})
+
+    assert response.status_code == 400
+    assert response.json()["request_id"] == response.headers["x-request-id"]
+
+
+def test_request_ids_are_unique(client):
+    """Each request is assigned its own ID."""
+    request_ids = {client.get("/health").headers["x-request-id"] for _ in range(5)}
+
+    assert len(request_ids) == 5
+
+
+def test_reseed_starts_a_new_request_id_sequence(monkeypatch):
+    """Reseeding, as done in forked workers, draws a new prefix and counter start."""
+    monkeypatch.setattr(ids, "_PREFIX", ids._PREFIX)
+    monkeypatch.setattr(ids, "_counter", ids._counter)
+    prefix, count = ids._PREFIX, next(ids._counter)
+
+    ids._reseed()
 
-async def test_csv_reading():
-    """Test the CSV reading functionality with various scenarios."""
-
-    print("🧪 Testing CSV reading fixes...")
-
-    # Initialize mock services
-    mongo_service = MockMongoService()
-    openmrs_client = MockOpenMRSClient()
-    ingestion_service = TM2IngestionService(mongo_service, openmrs_client)
-
-    # Test data directory
-    data_dir = Path("data")
-
-    # Test 1: Normal CSV file
-    print("\n📄 Test 1: Reading normal CSV file")
-    csv_file_path = data_dir / "sample_tm2_dataset.csv"
-
-    if csv_file_path.exists():
-        with open(csv_file_path, 'rb') as f:
-            file_content = io.BytesIO(f.read())
-
-        # Simulate what happens in FastAPI (file already read once)
-        file_content.read()  # This moves the pointer to the end
-
-        try:
-            records = await ingestion_service._read_csv_file(file_content)
-            print(f"✅ Successfully read {len(records)} records")
-            print(f"   First record: {records[0] if records else 'None'}")
-        except Exception as e:
-            print(f"❌ Failed to read CSV: {e}")
-    else:
-        print("⚠️  Sample CSV file not found")
-
-    # Test 2: Empty file
-    print("\n📄 Test 2: Reading empty file")
-    empty_file = io.BytesIO(b"")
-    try:
-        records = await ingestion_service._read_csv_file(empty_file)
-        print("❌ Should have failed for empty file")
-    except ValueError as e:
-        print(f"✅ Correctly rejected empty file: {e}")
-    except Exception as e:
-        print(f"❌ Unexpected error for empty file: {e}")
-
-    # Test 3: File with headers but no data
-    print("\n📄 Test 3: Reading file with headers but no data")
-    headers_only = io.BytesIO(b"patient_id,tm2_code,condition_name,system_type,severity,diagnosis_date,practitioner_id\n")
-    try:
-        records = await ingestion_service._read_csv_file(headers_only)
-        print("❌ Should have failed for headers-only file")
-    except ValueError as e:
-        print(f"✅ Correctly rejected headers-only file: {e}")
-    except Exception as e:
-        print(f"❌ Unexpected error for headers-only file: {e}")
-
-    # Test 4: File with wrong encoding (simulate)
-    print("\n📄 Test 4: Testing encoding fallback")
-    # Create a file with UTF-8 BOM to test encoding detection
-    utf8_bom_content = b'\xef\xbb\xbfpatient_id,tm2_code,condition_name,system_type,severity,diagnosis_date,practitioner_id\nP001,TM2.A01.01,Test,Ayurveda,Mild,2023-01-01,PRAC001\n'
-    bom_file = io.BytesIO(utf8_bom_content)
-    try:
-        records = await ingestion_service._read_csv_file(bom_file)
-        print(f"✅ Successfully handled UTF-8 BOM encoding, read {len(records)} records")
-    except Exception as e:
-        print(f"❌ Failed to handle UTF-8 BOM: {e}")
-
-    print("\n🎉 CSV reading tests completed!")
-
-
-if __name__ == "__main__":
-    asyncio.run(test_csv_reading())
+    # The prefix alone can repeat within one millisecond; both together
+    # repeat with probability 2**-74
+    assert (ids._PREFIX, next(ids._counter)) != (prefix, count + 1)